@@ -0,0 +1,203 @@
+# encoding: utf-8
+from common.file_operations import DynamicDataset
+from algorithm.iterated_greedy_algorithm import IteratedGreedy
+from algorithm.termination import Termination
+
+
+class AttackSession:
+    """
+    An IG solver kept across the steps of an attack.
+    The partition, the neighborhood structure and the node lists of the previous step are reused:
+    after the signs around a node are reversed, the k-hop region around the node is repaired by local moves, the
+    clusters are merged, and then a few global IG iterations are run.
+    The repairs keep the partition in the basin of the first solve, while a cold solve of a heavily attacked network
+    can find a quite different partition, so the repaired frustration drifts upwards with the attacks. restart()
+    bounds the drift by a short solve from scratch: with both on, the frustration after attacking half of the nodes
+    of the cluster model is within about 10% of a cold solve, and the robustness value within 0.005.
+    """
+
+    # the default number of global IG iterations after each repair
+    REFINE_ITER = 2
+    # the default number of IG iterations of the solve from scratch in restart()
+    RESTART_ITER = 20
+
+    def __init__(self, dataset: DynamicDataset, hops=1, refine_iter=REFINE_ITER, max_iter=150, beta=0.3, solution=None,
+                 time_limit=None, state=None):
+        """
+        class initialization, the dataset is solved once from scratch unless a solution is given
+
+        :param dataset: a dynamic dataset, its signs are only expected to be changed by self.reverse_node()
+        :param hops: radius of the region repaired after each attack
+        :param refine_iter: number of global IG iterations after the repair
+        :param max_iter: number of IG iterations of the first solve
+        :param beta: the destruction ratio of IG
+        :param solution: optional, a solution of the current dataset to continue from, e.g. from a checkpoint
+        :param time_limit: optional, seconds of the first solve
+        :param state: optional, with a solution, the state() of the session the solution comes from
+        """
+
+        self.dataset = dataset
+        self.hops = hops
+        self.refine_iter = refine_iter
+        self.beta = beta
+        self.alg = IteratedGreedy(dataset=dataset, beta=beta)
+        if solution is None:
+            self.alg.run(output=False, termination=Termination(max_iter=max(max_iter, 10), time_limit=time_limit))
+        else:
+            self.alg.start_from(solution)
+            if state is not None:
+                self.alg.ct, self.alg.T = state['ct'], state['T']
+                # the order in which IG draws the nodes, node_list of the local search is the same list
+                self.alg.node_available[:] = state['node_available']
+        self.__position = {node: i for i, node in enumerate(self.alg.node_available)}
+
+    @property
+    def objective_function(self):
+        return self.alg.objective_function
+
+    def reverse_node(self, v, refine_iter=None):
+        """
+        reverse the signs of the edges around v and repair the partition
+
+        :param v: number of node
+        :param refine_iter: number of global IG iterations, default: self.refine_iter
+        :return: current frustration index
+        """
+
+        obj = self.alg.objective_function
+        affected = set(self.dataset.data[v].keys())
+        affected.add(v)
+
+        self.dataset.reverse_node(v)
+        # each reversed edge turns from frustrated to balanced or the reverse under the current partition
+        obj.obj_value += self.__change_of_frustration(v)
+        self.__update_neighborhood(affected)
+
+        self.alg.local_search.local_move(nodes=self.__region(v))
+        self.alg.local_search.community_merge()
+        refine_iter = self.refine_iter if refine_iter is None else refine_iter
+        if refine_iter:
+            self.alg.refine(refine_iter)
+
+        return obj.obj_value
+
+    def restart(self, max_iter=RESTART_ITER):
+        """
+        solve the current dataset from scratch with a few IG iterations, and continue from that solution if it is
+        better than the repaired one
+
+        :param max_iter: number of IG iterations of the solve from scratch
+        :return: current frustration index
+        """
+
+        fresh = IteratedGreedy(dataset=self.dataset, beta=self.beta)
+        fresh.run(output=False, termination=Termination(max_iter=max_iter, extend=0))
+        if fresh.objective_function.obj_value < self.alg.objective_function.obj_value:
+            self.alg.start_from(fresh.objective_function.solution)
+        return self.alg.objective_function.obj_value
+
+    def state(self) -> dict:
+        """
+        :return: the state of the IG solver besides the solution, e.g. for a checkpoint
+        """
+
+        alg = self.alg
+        return {'ct': alg.ct, 'T': alg.T, 'node_available': list(alg.node_available)}
+
+    def __change_of_frustration(self, v):
+        solution = self.alg.objective_function.solution
+        cid = solution[v]
+        frustrated, total = 0, 0
+        for nbr, attr in self.dataset.data[v].items():
+            if nbr == v:
+                continue
+            total += 1
+            if (solution[nbr] == cid) == (attr < 0):
+                frustrated += 1
+
+        # frustrated edges after the reversal minus those before
+        return 2 * frustrated - total
+
+    def __update_neighborhood(self, affected):
+        """
+        rebuild the neighborhood of the affected nodes the same way as IteratedGreedy.__pretreatment():
+        a node without positive edges is removed from the neighborhood structure and left alone in a cluster
+        """
+
+        structure = self.alg.neighborhood.neighborhood_structure
+        data = self.dataset.data
+        signed = {}
+        for x in affected:
+            pos = {y for y, attr in data[x].items() if attr > 0}
+            neg = {y for y, attr in data[x].items() if attr < 0}
+            signed[x] = pos, neg
+        was_available = {x: x in structure for x in affected}
+        available = {x: bool(signed[x][0]) for x in affected}
+        index = self.alg.objective_function.cluster_index
+        index.remove_nodes(affected)
+
+        for x in affected:
+            if available[x]:
+                pos, neg = signed[x]
+                structure[x] = {
+                    '+': pos,
+                    '-': {y for y in neg if (available[y] if y in available else y in structure)}
+                }
+            else:
+                structure.pop(x, None)
+
+        changed = [x for x in affected if available[x] != was_available[x]]
+        for x in changed:
+            for y in signed[x][1]:
+                if y in affected or y not in structure:
+                    continue
+                if available[x]:
+                    structure[y]['-'].add(x)
+                else:
+                    structure[y]['-'].discard(x)
+        index.add_nodes(affected)
+
+        for x in changed:
+            if available[x]:
+                self.__activate(x)
+            else:
+                self.__deactivate(x)
+
+    def __activate(self, x):
+        # an isolated node is alone in its cluster, so the cluster joins the search again
+        ls = self.alg.local_search
+        ls.abandoned.discard(self.alg.objective_function.solution[x])
+        self.__position[x] = len(ls.node_list)
+        ls.node_list.append(x)
+
+    def __deactivate(self, x):
+        obj = self.alg.objective_function
+        ls = self.alg.local_search
+        cid = obj.solution[x]
+        if len(obj.partition[cid]) > 1:
+            # all the edges of x are negative now
+            delta = -sum(1 for y in self.dataset.data[x].keys() if y != x and obj.solution[y] == cid)
+            obj.decompose(x, delta, force=True)
+        ls.abandoned.add(obj.solution[x])
+
+        # node_list is shared with IteratedGreedy.node_available, the last node takes the place of x
+        i = self.__position.pop(x)
+        last = ls.node_list.pop()
+        if last != x:
+            ls.node_list[i] = last
+            self.__position[last] = i
+
+    def __region(self, v):
+        """
+        :return: the available nodes within self.hops hops from v
+        """
+
+        structure = self.alg.neighborhood.neighborhood_structure
+        data = self.dataset.data
+        region = {v}
+        frontier = {v}
+        for _ in range(self.hops):
+            frontier = {y for x in frontier for y in data[x].keys()} - region
+            region |= frontier
+
+        return [x for x in region if x in structure]
@@ -0,0 +1,58 @@
+# encoding: utf-8
+import json
+import time
+
+
+class IGStats:
+    """
+    The statistics of an IG run, only collected when IteratedGreedy is created with stats=True.
+
+    phases: {phase: [total seconds, number of calls]}
+        initialization, destruction, reconstruction, local_move, community_merge, acceptance
+    counters: {name: count}
+        move, merge, decompose: the operations applied to the partition
+        delta_move, delta_merge, delta_decompose: the evaluations of candidate operations
+        accepted, rejected, rolled_back_nodes: the acceptance criterion
+    sweeps: number of sweeps of each local_move() until no node is moved
+    """
+
+    def __init__(self):
+        self.phases = {}
+        self.counters = {}
+        self.sweeps = []
+        self.iterations = 0
+        self.start_time = time.perf_counter()
+
+    def count(self, name, n=1):
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def add_time(self, phase, seconds):
+        record = self.phases.get(phase)
+        if record is None:
+            self.phases[phase] = [seconds, 1]
+        else:
+            record[0] += seconds
+            record[1] += 1
+
+    def to_dict(self) -> dict:
+        """
+        :return: a JSON-serializable summary
+        """
+
+        total = time.perf_counter() - self.start_time
+        return {
+            'iterations': self.iterations,
+            'seconds': total,
+            'phases': {phase: {'seconds': seconds, 'calls': calls, 'share': seconds / total if total else 0.0}
+                       for phase, (seconds, calls) in self.phases.items()},
+            'counters': dict(self.counters),
+            'sweeps': {
+                'calls': len(self.sweeps),
+                'total': sum(self.sweeps),
+                'max': max(self.sweeps, default=0),
+                'mean': sum(self.sweeps) / len(self.sweeps) if self.sweeps else 0.0
+            }
+        }
+
+    def to_json(self, **kwargs) -> str:
+        return json.dumps(self.to_dict(), **kwargs)
@@ -2,6 +2,8 @@
 from balance import *
 from common.file_operations import Dataset
 from common.file_operations import FileOperations
+from algorithm.ig_stats import IGStats
+from algorithm.termination import Termination
 
 import time
 import math
@@ -24,24 +26,36 @@ class IteratedGreedy:
         4. return s_*
     """
 
-    def __init__(self, dataset: Dataset, beta=0.3):
+    def __init__(self, dataset: Dataset, beta=0.3, roulette=False, stats=False):
         """
         class initialization
 
         :param dataset: a given dataset
+        :param beta: the destruction ratio
+        :param roulette: in the early iterations, part of the destroyed nodes are drawn by their frustration
+        :param stats: collect the time of each phase and the counts of the operations in self.stats, see IGStats
         """
         self._dataset = dataset
         self.neighborhood = Neighborhood(dataset=dataset)
         self.objective_function = Frustration(dataset)
         self.node_available = self.__pretreatment()
+        self.objective_function.attach_index(self.neighborhood.neighborhood_structure)
         self.local_search = LocalSearch(self.objective_function, self.neighborhood, self.node_available)
         self.beta = beta
+        self.roulette = roulette
         self.T = 0
         self.ct = 1
+        self.stats = IGStats() if stats else None
+        self.objective_function.stats = self.stats
+        # the Termination of the last run, see self.termination.reason
+        self.termination = None
 
-    def initialization(self, output=True):
+    def initialization(self, output=True, multi_start=False, starts=8, workers=None):
         init = Initialization(self._dataset, self.neighborhood)
-        solution, partition = init.greedy_initialization(self.objective_function)
+        if multi_start:
+            solution, partition = init.multi_start_greedy_initialization(starts=starts, workers=workers)
+        else:
+            solution, partition = init.greedy_initialization(self.objective_function)
         self.objective_function.set_solution(solution)
         self.objective_function.update_objective_function()
         self.T = self.objective_function.obj_value
@@ -50,72 +64,175 @@ class IteratedGreedy:
             print("Initial value:", self.objective_function.obj_value)
             print('Num of initial clusters', len(self.objective_function.partition))
 
+    def lower_bound(self, max_length=4):
+        """
+        a proven lower bound of the frustration index, see balance_utils.frustration_lower_bound()
+        The run can stop as soon as it is matched: Termination(lower_bound=alg.lower_bound()).
+
+        :param max_length: the longest positive path searched for each negative edge
+        :return: a lower bound of the frustration index
+        """
+        return utils.frustration_lower_bound(self.neighborhood.neighborhood_structure, max_length=max_length)
+
+    def start_from(self, solution):
+        """
+        take a solution found before as the current one, e.g. from a checkpoint, without initialization
+
+        :param solution: a solution vector over all the nodes
+        :return: current objective function value
+        """
+
+        obj = self.objective_function
+        obj.set_solution(solution)
+        self.T = obj.update_objective_function()
+        # the nodes out of the neighborhood structure stay alone, their clusters are not searched
+        available = set(self.node_available)
+        self.local_search.abandoned = {obj.solution[x] for x in range(self._dataset.vnum) if x not in available}
+        return obj.obj_value
+
     def destruction_and_reconstruction(self):
-        destruction_nodes = self.__destruction()
-        self.__reconstruction(destruction_nodes)
+        if self.stats is None:
+            destruction_nodes = self.__destruction(roulette=self.roulette)
+            self.__reconstruction(destruction_nodes)
+        else:
+            destruction_nodes = self._timed('destruction', self.__destruction, roulette=self.roulette)
+            self._timed('reconstruction', self.__reconstruction, destruction_nodes)
+
+    def _timed(self, phase, fn, *args, **kwargs):
+        """
+        call fn and add its time to the phase in self.stats
+        """
+
+        start = time.perf_counter()
+        result = fn(*args, **kwargs)
+        self.stats.add_time(phase, time.perf_counter() - start)
+        return result
 
     def acceptance_criterion(self, status, alpha=0.99, method='metropolis'):
         obj = self.objective_function
-        last_solution = status['solution']
         last_value = status['value']
         if method == 'better':
-            if last_value < obj.obj_value:
-                obj.set_solution(last_solution)
-                obj.obj_value = last_value
+            rejected = last_value < obj.obj_value
         else:
+            rejected = last_value < obj.obj_value and rd.random() > math.exp((last_value - obj.obj_value) / self.T)
 
-            if last_value < obj.obj_value and rd.random() > math.exp((last_value - obj.obj_value) / self.T):
-                obj.set_solution(last_solution)
-                obj.obj_value = last_value
+        if rejected:
+            self.__restore(status)
+        else:
+            obj.commit_journal()
+        if self.stats is not None:
+            self.stats.count('rejected' if rejected else 'accepted')
         self.T *= alpha
 
-    def run(self, max_iter=2000, output=True, multi_start=False):
-        print("IG is running……")
-        max_iter = max(max_iter, 10)
+    def __restore(self, status):
+        obj = self.objective_function
+        if 'solution' in status:
+            obj.set_solution(status['solution'])
+            obj.obj_value = status['value']
+        else:
+            obj.rollback_journal()
+
+    def run(self, max_iter=2000, output=True, multi_start=False, starts=8, workers=None, termination=None):
+        """
+        :param max_iter: number of iterations, at least 10, extended while the value still changes near the end
+        :param output: print the progress
+        :param multi_start: see initialization()
+        :param starts: see initialization()
+        :param workers: see initialization()
+        :param termination: optional, an instance of Termination replacing max_iter, e.g. with a time limit
+        :return: the objective function value after each iteration
+        """
+        if output:
+            print("IG is running……")
+        if termination is None:
+            termination = Termination(max_iter=max(max_iter, 10))
+        self.termination = termination
         start_time = time.time()
-        if not multi_start:
-            self.initialization(output=output)
+        # the time limit covers the initialization
+        termination.start()
+        init_start = time.perf_counter()
+        self.initialization(output=output, multi_start=multi_start, starts=starts, workers=workers)
         abandoned = self._dataset.vnum - len(self.node_available)
         ls = self.local_search
         ls.local_move()
         ls.community_merge()
+        if self.stats is not None:
+            self.stats.add_time('initialization', time.perf_counter() - init_start)
         best_values = []
 
-        while self.ct <= max_iter:
-            status = self.record_status()
-            self.destruction_and_reconstruction()
-            ls.local_move()
-            ls.community_merge()
-
-            self.acceptance_criterion(status, method='better')
+        while True:
+            self.iterate()
 
             if output:
                 current_time = time.time()
                 print("execution time: ", current_time - start_time, "s")
                 print('%d/%d: best value --> %d with %d clusters' %
-                      (self.ct, max_iter, self.objective_function.obj_value, len(self.objective_function.partition) - abandoned))
+                      (self.ct, termination.max_iter, self.objective_function.obj_value,
+                       len(self.objective_function.partition) - abandoned))
             best_values.append(self.objective_function.obj_value)
             self.ct += 1
-            if self.ct == max_iter and best_values[-10] != best_values[-1]:
-                max_iter += 10
-
-        end_time = time.time()
-        print('IG Complete!')
-        print('=' * 40)
-        print('Best Value:', self.objective_function.obj_value)
-        print('time cost:', end_time - start_time, "s")
+            if termination.should_stop(len(best_values), best_values):
+                break
+
+        if output:
+            end_time = time.time()
+            print('IG Complete!')
+            print('Stopped by:', termination.reason)
+            print('=' * 40)
+            print('Best Value:', self.objective_function.obj_value)
+            print('time cost:', end_time - start_time, "s")
         return best_values
 
-    def record_status(self):
+    def iterate(self):
+        """
+        one iteration of IG: destruction, reconstruction, local search and acceptance
+
+        :return: None
+        """
+
+        ls = self.local_search
+        status = self.record_status()
+        self.destruction_and_reconstruction()
+        if self.stats is None:
+            ls.local_move()
+            ls.community_merge()
+            self.acceptance_criterion(status, method='better')
+        else:
+            self._timed('local_move', ls.local_move)
+            self._timed('community_merge', ls.community_merge)
+            self._timed('acceptance', self.acceptance_criterion, status, method='better')
+            self.stats.iterations += 1
+
+    def refine(self, iterations):
+        """
+        continue from the current partition without initialization, e.g. after the dataset is changed slightly
+
+        :param iterations: number of IG iterations
+        :return: current objective function value
+        """
+
+        for _ in range(iterations):
+            self.iterate()
+            self.ct += 1
+
+        return self.objective_function.obj_value
+
+    def record_status(self, copy=False):
         """
         for acceptance criterion
+        By default the changes made afterwards are journaled, so a rejection only rolls back the changed nodes.
 
+        :param copy: store a full copy of the solution instead of a journal
         :return: current partition status
         """
+        obj = self.objective_function
         status = {
-            'solution': self.objective_function.solution.copy(),
-            'value': self.objective_function.obj_value
+            'value': obj.obj_value
         }
+        if copy:
+            status['solution'] = obj.solution.copy()
+        else:
+            obj.begin_journal()
         return status
 
     def __destruction(self, roulette=False) -> list:
@@ -125,28 +242,14 @@ class IteratedGreedy:
         :return: a list of the removed nodes
         """
 
-        def get_frustration_of_clusters():
-            frustrations = {}
-            partition = self.objective_function.partition
-            ns = self.neighborhood.neighborhood_structure
-
-            for cid, community in partition.items():
-                # calculate the frustration for each cluster
-                for single_node in community:
-                    if single_node not in ns:
-                        continue
-                    node_nbr = ns[single_node]
-                    frustrations[single_node] = len(node_nbr['+'] - community) + len(community & node_nbr['-'])
-
-            return frustrations
-
         obj = self.objective_function
         num_of_removed = int(obj.vnum * self.beta)
         if 0.9 ** self.ct > 0.1 and roulette:
-            candidate = get_frustration_of_clusters()
+            # the weights are updated in place with the nodes moved since the last destruction
+            sampler = obj.frustration_sampler(self.neighborhood.neighborhood_structure)
             num_of_roulette = int(num_of_removed * 0.9 ** self.ct)
             random_selected_node = rd.sample(self.node_available, num_of_removed - num_of_roulette)
-            removed_node = utils.roulette(candidate, num_of_roulette)
+            removed_node = sampler.sample(num_of_roulette)
             removed_node.extend(random_selected_node)
             removed_node = list(set(removed_node))
         else:
@@ -169,15 +272,7 @@ class IteratedGreedy:
         nbr = self.neighborhood
 
         for node in isolated_node:
-            min_delta = 0
-            candidate = -1
-
-            for nbr_community in nbr.get_adjacent_cluster(node, obj.solution):
-
-                delta = obj.delta_caused_by_move(node, nbr_community, nbr.neighborhood_structure[node])
-                if delta < min_delta:
-                    min_delta = delta
-                    candidate = nbr_community
+            candidate, min_delta = obj.best_move(node, nbr)
             if candidate != -1:
                 obj.move(node, candidate, min_delta)
 
@@ -0,0 +1,83 @@
+# encoding: utf-8
+import time
+
+
+class Termination:
+    """
+    The stopping rules of IteratedGreedy.run(), checked after each iteration.
+        max_iter: number of iterations, extended by `extend` iterations while the value still changes near the end
+        stall: stop after this many iterations without improvement
+        time_limit: stop when the wall-clock time of the run exceeds this many seconds
+        target: stop when the value is not larger than the target
+        lower_bound: stop when the value matches a proven lower bound, e.g. IteratedGreedy.lower_bound()
+    The reason of the stop is left in self.reason.
+    """
+
+    MAX_ITER = 'max_iter'
+    STALL = 'stall'
+    TIME_LIMIT = 'time_limit'
+    TARGET = 'target'
+    LOWER_BOUND = 'lower_bound'
+
+    def __init__(self, max_iter=2000, extend=10, stall=None, time_limit=None, target=None, lower_bound=None):
+        """
+        class initialization, the rules left None are not checked
+
+        :param max_iter: number of iterations
+        :param extend: the extension of max_iter, 0 for none
+        :param stall: number of iterations without improvement
+        :param time_limit: seconds
+        :param target: objective function value
+        :param lower_bound: a lower bound of the objective function value
+        """
+        self.max_iter = max_iter
+        self.extend = extend
+        self.stall = stall
+        self.time_limit = time_limit
+        self.target = target
+        self.lower_bound = lower_bound
+        self.reason = None
+        self.start_time = None
+        self.best_value = None
+        self.best_iter = 0
+
+    def start(self):
+        """
+        reset the clock and the best value, called at the beginning of a run
+        """
+        self.reason = None
+        self.start_time = time.perf_counter()
+        self.best_value = None
+        self.best_iter = 0
+
+    def elapsed(self):
+        return time.perf_counter() - self.start_time
+
+    def should_stop(self, iteration, values) -> bool:
+        """
+        :param iteration: number of iterations done
+        :param values: the objective function value after each iteration
+        :return: True if the run should stop, see self.reason
+        """
+
+        value = values[-1]
+        if self.best_value is None or value < self.best_value:
+            self.best_value = value
+            self.best_iter = iteration
+
+        if self.target is not None and value <= self.target:
+            self.reason = Termination.TARGET
+        elif self.lower_bound is not None and value <= self.lower_bound:
+            self.reason = Termination.LOWER_BOUND
+        elif self.time_limit is not None and self.elapsed() >= self.time_limit:
+            self.reason = Termination.TIME_LIMIT
+        elif self.stall is not None and iteration - self.best_iter >= self.stall:
+            self.reason = Termination.STALL
+        else:
+            # one iteration before the end, the run goes on if the value has changed in the last iterations
+            if self.extend and iteration + 1 == self.max_iter and values[-min(self.extend, len(values))] != value:
+                self.max_iter += self.extend
+            if iteration >= self.max_iter:
+                self.reason = Termination.MAX_ITER
+
+        return self.reason is not None
@@ -15,4 +15,6 @@ The data structure of this program is agreed here.
     example: self.partition = {0: {0, 1, 2}, 1: {3, 4, 5}, 2: {6}}
 3. The dataset is represented by a two-dimensional default dict.
     example: defaultdict(lambda: defaultdict(lambda: 0))
+    * A CompactDataset (common.signed_graph) stores the same graph in CSR arrays,
+      and its data attribute can be read in the same way.
 """
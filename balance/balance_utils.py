@@ -3,6 +3,8 @@
 import collections
 import numpy as np
 from common.file_operations import Dataset
+from common.edge_list_parser import parse_edge_list, POSITIVE, NEGATIVE, ZERO
+from balance.weighted_sampler import weighted_sample
 # import networkx
 # import matplotlib.pyplot
 
@@ -33,7 +35,7 @@ def partition2solution(partition: dict, vnum: int, solution_type='list') -> dict
             solution[node] = idx
 
     if solution_type == 'array':
-        return
+        return np.array(solution, dtype=np.int32)
     elif solution_type == 'dict':
         return {i: solution[i] for i in range(vnum)}
     else:
@@ -58,27 +60,140 @@ def solution2partition(solution: dict or np.array or list) -> dict:
         for node, comm in enumerate(solution):
             partition[comm].add(node)
 
+    elif isinstance(solution, np.ndarray):
+        for node, comm in enumerate(solution.tolist()):
+            partition[comm].add(node)
+
     else:
         raise TypeError('Wrong type of solution')
 
     return partition
 
 
-def default_initialization(vnum: int) -> (list or dict, dict):
+def default_initialization(vnum: int, solution_type='dict') -> (list or dict, dict):
     """
     Initialization: treat each node as an independent cluster
 
     :param vnum: number of vertices in a network
+    :param solution_type: enum {"dict", "array"}
     :return: a solution vector and a partition
     """
 
     partition = dict()
-    solution = dict(enumerate(list(range(vnum))))
+    if solution_type == 'array':
+        solution = np.arange(vnum, dtype=np.int32)
+    else:
+        solution = dict(enumerate(list(range(vnum))))
     for i in range(vnum):
         partition[i] = {i}
     return solution, partition
 
 
+def solution2array(solution: dict or np.array or list, vnum=None) -> np.array:
+    """
+    convert a solution vector into an int32 array, an array is returned as it is
+
+    :param solution: a solution vector
+    :param vnum: length of the array, default: length of the solution
+    :return: np.ndarray of cluster ids
+    """
+
+    if isinstance(solution, np.ndarray) and solution.dtype == np.int32:
+        return solution
+    if isinstance(solution, dict):
+        array = np.zeros(max(vnum or 0, max(solution.keys(), default=-1) + 1), dtype=np.int32)
+        array[np.fromiter(solution.keys(), dtype=np.int64, count=len(solution))] = \
+            np.fromiter(solution.values(), dtype=np.int64, count=len(solution))
+        return array
+    return np.asarray(solution, dtype=np.int32)
+
+
+def frustration_of_edges(src: np.array, dst: np.array, signs: np.array, solution) -> int:
+    """
+    calculate the line index of structural balance over edge arrays in one pass, O(m)
+    Each undirected edge is expected once.
+
+    :param src: the first end of each edge
+    :param dst: the second end of each edge
+    :param signs: the sign of each edge
+    :param solution: a solution vector, an int32 array is used without conversion
+    :return: frustration index
+    """
+
+    solution = solution2array(solution)
+    same = solution[src] == solution[dst]
+    # negative edges within clusters and positive edges between clusters
+    frustrated = np.where(same, signs < 0, signs > 0)
+    return int(np.count_nonzero(frustrated))
+
+
+def node_frustrations(partition: dict, neighbor_structure: dict, default=None) -> dict:
+    """
+    calculate the frustration of each node from scratch: positive edges to other clusters and negative edges inside
+    Frustration.node_frustrations() reads the same values from the cluster index without recomputing them.
+
+    :param partition: a partition
+    :param neighbor_structure: the neighborhood structure
+    :param default: the value of the nodes out of the neighborhood structure, they are skipped if it is None
+    :return: {node: frustration}
+    """
+
+    frustrations = {}
+    for cid, community in partition.items():
+        for single_node in community:
+            if single_node not in neighbor_structure:
+                if default is not None:
+                    frustrations[single_node] = default
+                continue
+            node_nbr = neighbor_structure[single_node]
+            frustrations[single_node] = len(node_nbr['+'] - community) + len(community & node_nbr['-'])
+
+    return frustrations
+
+
+def frustration_lower_bound(neighbor_structure: dict, max_length=4) -> int:
+    """
+    a proven lower bound of the frustration index by packing edge-disjoint unbalanced cycles
+    Every cycle with an odd number of negative edges has at least one frustrated edge under any partition, so the
+    number of edge-disjoint such cycles is a lower bound. Each negative edge is closed greedily by the shortest path
+    of unused positive edges, no longer than max_length, so the bound is cheap but not tight.
+
+    :param neighbor_structure: the neighborhood structure
+    :param max_length: the longest positive path searched for each negative edge
+    :return: a lower bound of the frustration index
+    """
+
+    used = set()
+    bound = 0
+    for u, node_nbr in neighbor_structure.items():
+        for v in node_nbr['-']:
+            if v <= u or v not in neighbor_structure:
+                continue
+            # breadth first search over the unused positive edges from u to v
+            parent = {u: None}
+            frontier = [u]
+            for _ in range(max_length):
+                next_frontier = []
+                for x in frontier:
+                    for y in neighbor_structure[x]['+']:
+                        if y in parent or y not in neighbor_structure or (min(x, y), max(x, y)) in used:
+                            continue
+                        parent[y] = x
+                        next_frontier.append(y)
+                if v in parent or not next_frontier:
+                    break
+                frontier = next_frontier
+            if v not in parent:
+                continue
+            x = v
+            while parent[x] is not None:
+                used.add((min(x, parent[x]), max(x, parent[x])))
+                x = parent[x]
+            bound += 1
+
+    return bound
+
+
 def reform_partition(partition: dict) -> dict:
     """
     let cluster id start from 0
@@ -96,20 +211,14 @@ def reform_partition(partition: dict) -> dict:
 
 
 def roulette(candidate: dict, n: int):
-    import random as rd
-    chosen = set()
-    candidate = {k: v for k, v in candidate.items() if v > 0}
-    max_element = sum(candidate.values())
-    while len(chosen) < n:
-        print(len(chosen), n)
-        random_element = rd.randint(0, max_element - 1)
-        for k, v in candidate.items():
-            if v > random_element:
-                chosen.add(k)
-                break
-            else:
-                random_element -= v
-    return list(chosen)
+    """
+    draw n different items by roulette wheel selection, see weighted_sampler.weighted_sample()
+
+    :param candidate: {item: weight}, the items with non-positive weights are never chosen
+    :param n: number of items, all the items with positive weights are returned if n is larger
+    :return: a list of items
+    """
+    return weighted_sample(candidate, n)
 
 
 def collect_degree_info(dataset: Dataset, neighborhood) -> dict:
@@ -156,29 +265,19 @@ def get_mean_and_std(data: list):
     return mean, std
 
 
-def get_dataset_info(path):
+def get_dataset_info(path, workers=1):
     dataset_info = {}
-    node_set = set()
-    with open(path) as f:
-        header = f.readline()
-        vnum, enum = header.split()
-        dataset_info["vnum"], dataset_info["enum"] = int(vnum), int(enum)
-        penum, nenum, zenum = 0, 0, 0
-        for each in f:
-            n1, n2, attr = each.split()
-            node_set.add(n1)
-            node_set.add(n2)
-            if attr == '1' or attr == '1.0':
-                penum += 1
-            elif attr == '-1' or attr == '-1.0':
-                nenum += 1
-            elif attr == '0':
-                zenum += 1
-        dataset_info["positive enum"] = penum
-        dataset_info["negative enum"] = nenum
-        dataset_info['zero enum'] = zenum
-        dataset_info['unknown enum'] = int(enum) - penum - nenum - zenum
-        dataset_info["actual vnum"] = len(node_set)
+    edges = parse_edge_list(path, signed_only=False, workers=workers)
+    vnum, enum = edges.vnum, edges.enum
+    dataset_info["vnum"], dataset_info["enum"] = vnum, enum
+    penum = int(np.count_nonzero(edges.signs == POSITIVE))
+    nenum = int(np.count_nonzero(edges.signs == NEGATIVE))
+    zenum = int(np.count_nonzero(edges.signs == ZERO))
+    dataset_info["positive enum"] = penum
+    dataset_info["negative enum"] = nenum
+    dataset_info['zero enum'] = zenum
+    dataset_info['unknown enum'] = enum - penum - nenum - zenum
+    dataset_info["actual vnum"] = len(np.union1d(edges.src, edges.dst))
     return dataset_info
 
 
@@ -0,0 +1,336 @@
+# encoding: utf-8
+from balance.weighted_sampler import WeightedSampler
+
+
+class ClusterIndex:
+    """
+    The class of the node-to-cluster index.
+    The numbers of positive and negative edges from each node to each of its neighbor clusters are stored,
+    and they are updated when a node is moved, so the change of frustration of a move is read in O(1).
+    The same numbers between clusters form the cluster graph, so the change of frustration of a merge is read in O(1).
+
+    node_links: {node: {cluster_id: [number of positive edges, number of negative edges]}}
+    cluster_links: {cluster_id: {cluster_id: [number of positive edges, number of negative edges]}}, symmetric,
+                   the edges within a cluster are not stored
+    sampler: the nodes weighted by their frustration, see frustration_sampler()
+    touched: the nodes whose frustration may have changed since the sampler was updated, None without a sampler
+    """
+
+    def __init__(self, neighborhood_structure: dict, solution):
+        """
+        class initialization
+
+        :param neighborhood_structure: the neighborhood structure, see Neighborhood
+        :param solution: a reference to the solution vector, it is expected to be changed together with the index
+        """
+
+        self.neighborhood_structure = neighborhood_structure
+        self.solution = solution
+        self.node_links = dict()
+        self.cluster_links = dict()
+        self.sampler = None
+        self.touched = None
+        for node in neighborhood_structure:
+            self.node_links[node] = self.__collect_links(node)
+        for node, links in self.node_links.items():
+            cid = solution[node]
+            for other, count in links.items():
+                if other == cid:
+                    continue
+                # each edge is seen from both ends, so each direction is filled once
+                pair = self.cluster_links.setdefault(cid, dict())
+                if other in pair:
+                    pair[other][0] += count[0]
+                    pair[other][1] += count[1]
+                else:
+                    pair[other] = [count[0], count[1]]
+
+    def __collect_links(self, node) -> dict:
+        links = dict()
+        solution = self.solution
+        nbr = self.neighborhood_structure[node]
+        for v in nbr['+']:
+            cid = solution[v]
+            if cid in links:
+                links[cid][0] += 1
+            else:
+                links[cid] = [1, 0]
+        for v in nbr['-']:
+            cid = solution[v]
+            if cid in links:
+                links[cid][1] += 1
+            else:
+                links[cid] = [0, 1]
+        return links
+
+    def __shift(self, node, source, destination):
+        # the edges to node are moved from the source cluster to the destination cluster in the links of neighbors
+        nbr = self.neighborhood_structure.get(node)
+        if nbr is None:
+            return
+        if self.touched is not None:
+            self.__touch(node, nbr)
+        node_links = self.node_links
+        for sign, nodes in ((0, nbr['+']), (1, nbr['-'])):
+            for v in nodes:
+                links = node_links[v]
+                count = links[source]
+                count[sign] -= 1
+                if not count[0] and not count[1]:
+                    del links[source]
+                if destination in links:
+                    links[destination][sign] += 1
+                else:
+                    count = [0, 0]
+                    count[sign] = 1
+                    links[destination] = count
+
+    def __touch(self, node, nbr):
+        # the frustration of a node changes with the cluster of the node and the clusters of its neighbors
+        self.touched.add(node)
+        self.touched.update(nbr['+'])
+        self.touched.update(nbr['-'])
+
+    def __link(self, c1, c2, pos, neg):
+        # add edges between two different clusters in both directions
+        for a, b in ((c1, c2), (c2, c1)):
+            pair = self.cluster_links.get(a)
+            if pair is None:
+                pair = self.cluster_links[a] = dict()
+            count = pair.get(b)
+            if count is None:
+                pair[b] = [pos, neg]
+                continue
+            count[0] += pos
+            count[1] += neg
+            if not count[0] and not count[1]:
+                del pair[b]
+                if not pair:
+                    del self.cluster_links[a]
+
+    def on_move(self, node, source, destination):
+        """
+        update the index when a node is moved from the source cluster to the destination cluster
+
+        :return: None
+        """
+
+        links = self.node_links.get(node)
+        if links:
+            nbr = self.neighborhood_structure[node]
+            for cid, (pos, neg) in list(links.items()):
+                if cid == source:
+                    # a self-loop stays within the cluster of the node
+                    pos -= node in nbr['+']
+                    neg -= node in nbr['-']
+                else:
+                    self.__link(source, cid, -pos, -neg)
+                if cid != destination and (pos or neg):
+                    self.__link(destination, cid, pos, neg)
+        self.__shift(node, source, destination)
+
+    def on_merge(self, c1, c2, members):
+        """
+        update the index when cluster c2 is merged into cluster c1
+
+        :param members: the nodes of cluster c2
+        :return: None
+        """
+
+        for node in members:
+            self.__shift(node, c2, c1)
+
+        # the edges between c1 and c2 are within the cluster now, the other links of c2 are added to c1
+        links = self.cluster_links.pop(c2, dict())
+        links.pop(c1, None)
+        merged = self.cluster_links.get(c1)
+        if merged is not None:
+            merged.pop(c2, None)
+            if not merged:
+                del self.cluster_links[c1]
+        for cid, (pos, neg) in links.items():
+            del self.cluster_links[cid][c2]
+            if not self.cluster_links[cid]:
+                del self.cluster_links[cid]
+            self.__link(c1, cid, pos, neg)
+
+    def adjacent_clusters(self, cid) -> dict:
+        """
+        :param cid: number of cluster
+        :return: {neighbor cluster: [number of positive edges, number of negative edges]}
+        """
+
+        return self.cluster_links.get(cid, dict())
+
+    def best_merge(self, cid):
+        """
+        the best neighbor cluster to be merged with a cluster, in one pass over its neighbor clusters
+
+        :param cid: number of cluster
+        :return: the best cluster and the change of frustration index, (-1, 0) if no merge is better
+        """
+
+        min_delta = 0
+        candidate = -1
+        for other, (pos, neg) in self.cluster_links.get(cid, dict()).items():
+            delta = neg - pos
+            if delta < min_delta:
+                min_delta = delta
+                candidate = other
+
+        return candidate, min_delta
+
+    def delta_caused_by_merge(self, c1, c2):
+        pos, neg = self.cluster_links.get(c1, dict()).get(c2, (0, 0))
+        return neg - pos
+
+    def best_move(self, node):
+        """
+        the best neighbor cluster of a node, in one pass over its neighbor clusters
+
+        :param node: number of node
+        :return: the best cluster and the change of frustration index, (-1, 0) if no move is better
+        """
+
+        links = self.node_links.get(node)
+        if not links:
+            return -1, 0
+        current = self.solution[node]
+        own = links.get(current)
+        base = own[0] - own[1] if own else 0
+
+        min_delta = 0
+        candidate = -1
+        for cid, (pos, neg) in links.items():
+            delta = base + neg - pos
+            if delta < min_delta and cid != current:
+                min_delta = delta
+                candidate = cid
+
+        return candidate, min_delta
+
+    def delta_caused_by_move(self, node, destination):
+        current = self.solution[node]
+        if current == destination:
+            return 0
+        links = self.node_links.get(node, {})
+        own = links.get(current, (0, 0))
+        target = links.get(destination, (0, 0))
+        return own[0] - own[1] + target[1] - target[0]
+
+    def delta_caused_by_decompose(self, node):
+        own = self.node_links.get(node, {}).get(self.solution[node], (0, 0))
+        return own[0] - own[1]
+
+    def node_frustration(self, node):
+        """
+        :param node: number of node
+        :return: the number of positive edges to other clusters and negative edges inside the cluster of the node
+        """
+
+        own = self.node_links.get(node, {}).get(self.solution[node], (0, 0))
+        return len(self.neighborhood_structure[node]['+']) - own[0] + own[1]
+
+    def frustrations(self) -> dict:
+        """
+        :return: {node: frustration} of all the nodes in the neighborhood structure
+        """
+
+        return {node: self.node_frustration(node) for node in self.neighborhood_structure}
+
+    def frustration_sampler(self) -> WeightedSampler:
+        """
+        a sampler of the nodes weighted by their frustration, built at the first call,
+        then the weights of the nodes changed since the last call are updated in place
+
+        :return: an instance of WeightedSampler
+        """
+
+        if self.sampler is not None:
+            structure = self.neighborhood_structure
+            touched = self.touched
+            if all(node in self.sampler.position for node in touched if node in structure):
+                for node in touched:
+                    if node in self.sampler.position:
+                        self.sampler.update(node, self.node_frustration(node) if node in structure else 0)
+                touched.clear()
+                return self.sampler
+
+        # a node new to the neighborhood structure is not in the sampler, it is built again
+        self.sampler = WeightedSampler(self.frustrations())
+        self.touched = set()
+        return self.sampler
+
+    def remove_nodes(self, nodes):
+        """
+        remove the nodes from the index before their neighborhoods are changed, see add_nodes()
+
+        :param nodes: a set of nodes
+        :return: None
+        """
+
+        solution = self.solution
+        self.__link_edges(nodes, -1)
+        for node in nodes:
+            nbr = self.neighborhood_structure.get(node)
+            if nbr is None:
+                continue
+            if self.touched is not None:
+                self.__touch(node, nbr)
+            cid = solution[node]
+            for sign, others in ((0, nbr['+']), (1, nbr['-'])):
+                for v in others:
+                    if v in nodes:
+                        continue
+                    count = self.node_links[v][cid]
+                    count[sign] -= 1
+                    if not count[0] and not count[1]:
+                        del self.node_links[v][cid]
+            del self.node_links[node]
+
+    def add_nodes(self, nodes):
+        """
+        add the nodes back to the index after their neighborhoods are changed
+
+        :param nodes: a set of nodes
+        :return: None
+        """
+
+        solution = self.solution
+        self.__link_edges(nodes, 1)
+        for node in nodes:
+            nbr = self.neighborhood_structure.get(node)
+            if nbr is None:
+                continue
+            self.node_links[node] = self.__collect_links(node)
+            if self.touched is not None:
+                self.__touch(node, nbr)
+            cid = solution[node]
+            for sign, others in ((0, nbr['+']), (1, nbr['-'])):
+                for v in others:
+                    if v in nodes:
+                        continue
+                    links = self.node_links[v]
+                    if cid in links:
+                        links[cid][sign] += 1
+                    else:
+                        count = [0, 0]
+                        count[sign] = 1
+                        links[cid] = count
+
+    def __link_edges(self, nodes, k):
+        # add (k = 1) or remove (k = -1) the edges of the nodes in the cluster graph, each edge once
+        solution = self.solution
+        for node in nodes:
+            nbr = self.neighborhood_structure.get(node)
+            if nbr is None:
+                continue
+            cid = solution[node]
+            for sign, others in ((0, nbr['+']), (1, nbr['-'])):
+                for v in others:
+                    if v in nodes and v <= node or solution[v] == cid:
+                        continue
+                    if sign == 0:
+                        self.__link(cid, solution[v], k, 0)
+                    else:
+                        self.__link(cid, solution[v], 0, k)
@@ -1,4 +1,9 @@
+import numpy as np
 from balance.objective_function import ObjectiveFunction
+from balance.cluster_index import ClusterIndex
+from balance.weighted_sampler import WeightedSampler
+from balance import balance_utils as utils
+from common.signed_graph import CompactDataset
 
 
 class Frustration(ObjectiveFunction):
@@ -6,6 +11,26 @@ class Frustration(ObjectiveFunction):
     The class of the frustration, implements ObjectiveFunction.
     """
 
+    def attach_index(self, neighborhood_structure):
+        """
+        maintain a node-to-cluster index (see ClusterIndex) from now on, moves are then evaluated in O(1)
+
+        :param neighborhood_structure: the neighborhood structure used by the local search
+        :return: None
+        """
+
+        self.cluster_index = ClusterIndex(neighborhood_structure, self.solution)
+
+    def set_solution(self, solution):
+        super().set_solution(solution)
+        if self.cluster_index is not None:
+            self.attach_index(self.cluster_index.neighborhood_structure)
+
+    def _relabel(self, node, cid):
+        if self.cluster_index is not None:
+            self.cluster_index.on_move(node, self.solution[node], cid)
+        super()._relabel(node, cid)
+
     def objective_function(self):
         """
         calculate the line index of structural balance using a solution vector, O(m)
@@ -13,6 +38,9 @@ class Frustration(ObjectiveFunction):
         :return: frustration index
         """
 
+        if isinstance(self._dataset, CompactDataset):
+            return self.objective_function_vectorized()
+
         data = self._dataset.data
         sl = self.solution
         frustration = 0
@@ -30,6 +58,37 @@ class Frustration(ObjectiveFunction):
         assert frustration % 2 == 0
         return frustration // 2
 
+    def node_frustrations(self, neighborhood_structure=None, default=None) -> dict:
+        """
+        the frustration of each node, read from the cluster index when it is attached
+
+        :param neighborhood_structure: used when there is no cluster index, default: the structure of the index
+        :param default: the value of the nodes out of the neighborhood structure, they are skipped if it is None
+        :return: {node: frustration}
+        """
+
+        if self.cluster_index is None:
+            return utils.node_frustrations(self.partition, neighborhood_structure, default=default)
+
+        frustrations = self.cluster_index.frustrations()
+        if default is not None:
+            for community in self.partition.values():
+                for node in community:
+                    frustrations.setdefault(node, default)
+        return frustrations
+
+    def frustration_sampler(self, neighborhood_structure=None) -> WeightedSampler:
+        """
+        the nodes weighted by their frustration, kept up to date by the cluster index when it is attached
+
+        :param neighborhood_structure: used when there is no cluster index, see node_frustrations()
+        :return: an instance of WeightedSampler
+        """
+
+        if self.cluster_index is None:
+            return WeightedSampler(self.node_frustrations(neighborhood_structure))
+        return self.cluster_index.frustration_sampler()
+
     def objective_function_v2(self, neighborhood, partition=None):
         """
         calculate the line index of structural balance using a partition, more effective
@@ -59,17 +118,25 @@ class Frustration(ObjectiveFunction):
 
         return sum(frustrations.values()) // 2
 
-    def objective_function_native(self, triad):
+    def objective_function_vectorized(self, edges=None):
+        """
+        calculate the line index of structural balance over edge arrays, O(m) in numpy
 
-        sl = self.solution
-        frustration = 0
+        :param edges: (src, dst, signs) with each edge once, default: the edges of a CompactDataset
+        :return: frustration index
+        """
+
+        if edges is None:
+            edges = self._dataset.edge_list()
+        src, dst, signs = edges
+        solution = utils.solution2array(self.solution, self.vnum)
 
-        for n1, n2, attr in triad:
-            c1, c2 = sl[n1], sl[n2]
-            if c1 == c2 and attr == -1:
-                frustration += 1
-            elif c1 != c2 and attr == 1:
-                frustration += 1
+        return utils.frustration_of_edges(src, dst, signs, solution)
+
+    def objective_function_native(self, triad):
+
+        triad = np.asarray(triad, dtype=np.int64).reshape(-1, 3)
+        frustration = self.objective_function_vectorized(edges=(triad[:, 0], triad[:, 1], triad[:, 2]))
 
         return frustration // 2
 
@@ -83,6 +150,9 @@ class Frustration(ObjectiveFunction):
         :return: change of frustration index, negative if better
         """
 
+        if self.cluster_index is not None:
+            return self.cluster_index.delta_caused_by_move(node, destination)
+
         delta = 0
         current_cluster = self.solution[node]
 
@@ -109,6 +179,13 @@ class Frustration(ObjectiveFunction):
 
         return delta
 
+    def best_move(self, node, neighborhood):
+        if self.stats is not None:
+            self.stats.count('delta_move')
+        if self.cluster_index is not None:
+            return self.cluster_index.best_move(node)
+        return super().best_move(node, neighborhood)
+
     def move(self, node, destination, delta):
         """
         move the node into the destination cluster
@@ -121,6 +198,12 @@ class Frustration(ObjectiveFunction):
         """
 
         pre_cid = self.solution[node]
+        if self.journal is not None:
+            self.journal.append((node, pre_cid))
+        if self.stats is not None:
+            self.stats.count('move')
+        if self.cluster_index is not None:
+            self.cluster_index.on_move(node, pre_cid, destination)
 
         self.solution[node] = destination
         self.partition[pre_cid].remove(node)
@@ -140,21 +223,26 @@ class Frustration(ObjectiveFunction):
         :return: change of frustration index, negative if better
         """
 
+        if self.cluster_index is not None:
+            return self.cluster_index.delta_caused_by_merge(c1, c2)
+
         c1_community, c2_community = self.partition[c1], self.partition[c2]
-        data = self._dataset.data
         delta = 0
 
+        # the signs are read from the neighborhood, so that any kind of dataset is supported
         for node in c1_community:
-            intersection = (neighborhood[node]['+'] | neighborhood[node]['-']) & c2_community
-
-            for another_node in intersection:
-                if data[node][another_node] == 1:
-                    delta -= 1
-                elif data[node][another_node] == -1:
-                    delta += 1
+            delta -= len(neighborhood[node]['+'] & c2_community)
+            delta += len(neighborhood[node]['-'] & c2_community)
 
         return delta
 
+    def best_merge(self, cid, neighborhood):
+        if self.stats is not None:
+            self.stats.count('delta_merge')
+        if self.cluster_index is not None:
+            return self.cluster_index.best_merge(cid)
+        return super().best_merge(cid, neighborhood)
+
     def merge(self, c1, c2, delta):
         """
         merge cluster c2 into c1
@@ -166,6 +254,12 @@ class Frustration(ObjectiveFunction):
         :return: None
         """
 
+        if self.journal is not None:
+            self.journal.extend((node, c2) for node in self.partition[c2])
+        if self.stats is not None:
+            self.stats.count('merge')
+        if self.cluster_index is not None:
+            self.cluster_index.on_merge(c1, c2, self.partition[c2])
         for node in self.partition[c2]:
             self.solution[node] = c1
 
@@ -183,9 +277,13 @@ class Frustration(ObjectiveFunction):
         :return: change of frustration index, negative if better
         """
 
+        if self.stats is not None:
+            self.stats.count('delta_decompose')
         cid = self.solution[node]
         if len(self.partition[cid]) == 1:
             return 0
+        if self.cluster_index is not None:
+            return self.cluster_index.delta_caused_by_decompose(node)
 
         delta_pos = len([v for v in node_neighborhood['+'] if self.solution[v] == cid])
         delta_neg = len([v for v in node_neighborhood['-'] if self.solution[v] == cid])
@@ -200,23 +298,31 @@ class Frustration(ObjectiveFunction):
         assert delta == delta_pos - delta_neg
         return delta
 
-    def decompose(self, node, delta):
+    def decompose(self, node, delta, force=False):
         """
         move the node out of its current cluster
 
         :param node: number of node
         :param delta: change of the frustration index, obtained by delta_caused_by_decompose()
+        :param force: move the node out even if the frustration index doesn't change
         :return: None
         """
 
-        if delta == 0:
+        pre_cid = self.solution[node]
+        # a node alone is not moved, so that no cluster is left empty
+        if (delta == 0 and not force) or len(self.partition[pre_cid]) <= 1:
             return
+        if self.stats is not None:
+            self.stats.count('decompose')
 
-        pre_cid = self.solution[node]
         cid_available = node
         while cid_available in self.partition.keys():
             cid_available += 1
 
+        if self.journal is not None:
+            self.journal.append((node, pre_cid))
+        if self.cluster_index is not None:
+            self.cluster_index.on_move(node, pre_cid, cid_available)
         self.partition[cid_available] = {node}
         self.partition[pre_cid].remove(node)
         self.solution[node] = cid_available
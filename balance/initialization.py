@@ -1,9 +1,41 @@
 from common.file_operations import Dataset
+from common.signed_graph import CompactDataset
 from balance.local_search import LocalSearch
+from balance.neighborhood import Neighborhood
+from concurrent.futures import ProcessPoolExecutor
 
+import os
+import random as rd
 from balance import balance_utils as utils
 
 
+# the dataset and the neighborhood structure of a worker process, see multi_start_greedy_initialization()
+_shared_dataset = None
+_shared_structure = None
+
+
+def _init_worker(dataset, neighborhood_structure):
+    global _shared_dataset, _shared_structure
+    _shared_dataset, _shared_structure = dataset, neighborhood_structure
+
+
+def _greedy_start(seed):
+    """
+    one greedy initialization from singletons with its own node order
+
+    :param seed: random seed of the node order
+    :return: objective function value, solution as an int32 array
+    """
+    from balance.frustration import Frustration
+
+    rd.seed(seed)
+    neighborhood = Neighborhood.from_structure(_shared_dataset, _shared_structure)
+    obj_function = Frustration(_shared_dataset)
+    obj_function.attach_index(_shared_structure)
+    solution, _ = Initialization(_shared_dataset, neighborhood).greedy_initialization(obj_function)
+    return obj_function.obj_value, utils.solution2array(solution, _shared_dataset.vnum)
+
+
 class Initialization:
     """
     The class of initialization.
@@ -37,14 +69,44 @@ class Initialization:
         method.objective_function.update_objective_function()
         return method.objective_function.solution, method.objective_function.partition
 
-    def multi_start_greedy_initialization(self):
+    def multi_start_greedy_initialization(self, starts=8, workers=None, seed=None):
         """
         greedy initialization is cheap, multi start initialization for better performance
+        Each start shuffles the nodes with its own seed, so the result only depends on the seed.
 
-        :return: list or dict, partition: dict(cluster_id: set())
+        :param starts: number of greedy initializations
+        :param workers: number of processes, default: all the cores
+        :param seed: random seed of the first start, the r-th start uses seed + r, default: drawn from random
+        :return: solution: dict, partition: dict(cluster_id: set())
         """
 
-        best_solution, best_partition = None, None
-        best_value = 2 ** 64
-        # This method was removed because of some bugs.
+        if seed is None:
+            seed = rd.randrange(2 ** 31)
+        workers = min(workers or os.cpu_count(), starts)
+        seeds = [seed + r for r in range(starts)]
+
+        # the dict-based dataset cannot be sent to other processes
+        if isinstance(self._dataset, CompactDataset):
+            dataset = self._dataset
+        else:
+            dataset = CompactDataset.from_dataset(self._dataset)
+        structure = self.neighborhood.neighborhood_structure
+
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(dataset, structure)) as executor:
+                results = list(executor.map(_greedy_start, seeds))
+        else:
+            # the starts reseed the module random, the state of the caller is kept as if they ran in other processes
+            state = rd.getstate()
+            try:
+                _init_worker(dataset, structure)
+                results = [_greedy_start(s) for s in seeds]
+            finally:
+                rd.setstate(state)
+
+        # the first start wins a tie
+        best_value, best_solution = min(results, key=lambda x: x[0])
+        best_solution = dict(enumerate(best_solution.tolist()))
+        best_partition = utils.solution2partition(best_solution)
         return best_solution, best_partition
@@ -24,11 +24,12 @@ class LocalSearch:
             self.node_list = self.__node_sort(node_available=node_available)
             self.abandoned = set(range(obj_function.vnum)) - set(self.node_list)
 
-    def local_move(self):
+    def local_move(self, nodes=None):
         """
         each node is moved from its current cluster to neighbor clusters
         Note: solution and partition are changed in the iterations
 
+        :param nodes: optional, only these nodes are moved, default: all the available nodes
         :return: None
         """
 
@@ -36,6 +37,7 @@ class LocalSearch:
         ct = 0
         obj = self.objective_function
         nbr = self.neighborhood
+        node_list = self.node_list if nodes is None else nodes
 
         while improvement:
 
@@ -44,21 +46,17 @@ class LocalSearch:
 
             if ct >= 100:
                 break
-            for node in self.node_list:
+            for node in node_list:
 
-                min_delta = 0
-                candidate = -1
-
-                for nbr_cluster in nbr.get_adjacent_cluster(node, obj.solution):
-                    delta = obj.delta_caused_by_move(node, nbr_cluster, nbr.neighborhood_structure[node])
-                    if delta < min_delta:
-                        min_delta = delta
-                        candidate = nbr_cluster
+                candidate, min_delta = obj.best_move(node, nbr)
 
                 if candidate != -1:
                     obj.move(node, candidate, min_delta)
                     improvement = True
 
+        if obj.stats is not None:
+            obj.stats.sweeps.append(ct)
+
     def community_merge(self):
         """
         each cluster is attempted to be merged with its neighborhood clusters
@@ -81,14 +79,7 @@ class LocalSearch:
             if c1 in tabu_list:
                 continue
 
-            min_delta = 0
-            candidate = -1
-            for c2 in nbr.get_adjacent_cluster_of_cluster(c1, obj.solution, obj.partition):
-                delta = obj.delta_caused_by_merge(c1, c2, nbr.neighborhood_structure)
-                if delta < min_delta:
-                    min_delta = delta
-                    candidate = c2
-
+            candidate, min_delta = obj.best_merge(c1, nbr)
             if candidate != -1:
                 obj.merge(c1, candidate, min_delta)
                 tabu_list.add(c1)
@@ -1,6 +1,7 @@
 # encoding: utf-8
 
 from common.file_operations import Dataset
+from common.signed_graph import CompactDataset
 
 
 class Neighborhood:
@@ -19,6 +20,20 @@ class Neighborhood:
         self._dataset = dataset
         self.neighborhood_structure = self.__collect_neighbor_info()
 
+    @staticmethod
+    def from_structure(dataset: Dataset, neighborhood_structure: dict):
+        """
+        wrap an existing neighborhood structure, e.g. the one trimmed by IteratedGreedy
+
+        :param dataset: a reference to a Dataset instance
+        :param neighborhood_structure: {node_id: {"+": set(), "-": set()}}
+        :return: an instance of class Neighborhood
+        """
+        neighborhood = Neighborhood.__new__(Neighborhood)
+        neighborhood._dataset = dataset
+        neighborhood.neighborhood_structure = neighborhood_structure
+        return neighborhood
+
     def get_adjacent_cluster(self, node, solution) -> set:
         """
         dynamically get the adjacent clusters of a node under a specific partition
@@ -80,6 +95,13 @@ class Neighborhood:
         :return: a dictionary, {"+": set() of positive neighborhoods, "-": set() of negative neighborhoods}
         """
 
+        if isinstance(self._dataset, CompactDataset):
+            pos_nbr, neg_nbr = self._dataset.signed_neighbors(node)
+            return {
+                '+': set(pos_nbr.tolist()),
+                '-': set(neg_nbr.tolist())
+            }
+
         # prejudgment
         nbr = self._dataset.data[node].keys()
         nbr_values = self._dataset.data[node].values()
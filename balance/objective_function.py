@@ -11,19 +11,25 @@ class ObjectiveFunction:
     The specific objective function should inherit this class and implement the abstract methods.
     """
 
-    def __init__(self, dataset: Dataset, init_solution=None):
+    def __init__(self, dataset: Dataset, init_solution=None, solution_type='dict'):
         """
         class initialization
 
         :param dataset: a reference to a Dataset instance
         :param init_solution: optional, the initial solution vector
+        :param solution_type: enum {"dict", "array"}, the type of the default solution vector
         """
 
         self._dataset = dataset
         self.obj_value = dataset.enum
+        self.cluster_index = None
+        # [(node, previous cluster)] since begin_journal(), None if the changes are not journaled
+        self.journal = None
+        # optional, an object with count(name) to count the operations, e.g. algorithm.ig_stats.IGStats
+        self.stats = None
 
         if init_solution is None:
-            self.solution, self.partition = utils.default_initialization(self._dataset.vnum)
+            self.solution, self.partition = utils.default_initialization(self._dataset.vnum, solution_type)
         else:
             self.solution = init_solution
             self.partition = utils.solution2partition(init_solution)
@@ -38,6 +44,52 @@ class ObjectiveFunction:
         """
         self.solution = solution
         self.partition = utils.solution2partition(solution)
+        self.journal = None
+
+    def begin_journal(self):
+        """
+        start to record the changes of the solution, so that they can be rolled back by rollback_journal()
+
+        :return: None
+        """
+
+        self.journal = []
+        self._journal_value = self.obj_value
+
+    def commit_journal(self):
+        """
+        keep the changes since begin_journal() and stop recording
+
+        :return: None
+        """
+
+        self.journal = None
+
+    def rollback_journal(self):
+        """
+        undo the changes since begin_journal() in reverse order, only the changed nodes are touched
+
+        :return: None
+        """
+
+        journal, self.journal = self.journal, None
+        if self.stats is not None:
+            self.stats.count('rolled_back_nodes', len(journal))
+        for node, cid in reversed(journal):
+            self._relabel(node, cid)
+        self.obj_value = self._journal_value
+
+    def _relabel(self, node, cid):
+        """
+        put the node into a cluster without changing the objective function value, used by rollback_journal()
+        """
+
+        pre_cid = self.solution[node]
+        self.solution[node] = cid
+        self.partition[pre_cid].discard(node)
+        if not self.partition[pre_cid]:
+            del self.partition[pre_cid]
+        self.partition.setdefault(cid, set()).add(node)
 
     def update_objective_function(self):
         """
@@ -71,7 +123,45 @@ class ObjectiveFunction:
     def delta_caused_by_merge(self, c1, c2, neighborhood):
         pass
 
-    def decompose(self, node, delta):
+    def best_move(self, node, neighborhood):
+        """
+        find the neighbor cluster that improves the objective function most when the node is moved into it
+
+        :param node: number of node
+        :param neighborhood: an instance of Neighborhood
+        :return: the best cluster and the change of the objective function value, (-1, 0) if no move is better
+        """
+
+        min_delta = 0
+        candidate = -1
+        for nbr_cluster in neighborhood.get_adjacent_cluster(node, self.solution):
+            delta = self.delta_caused_by_move(node, nbr_cluster, neighborhood.neighborhood_structure[node])
+            if delta < min_delta:
+                min_delta = delta
+                candidate = nbr_cluster
+
+        return candidate, min_delta
+
+    def best_merge(self, cid, neighborhood):
+        """
+        find the neighbor cluster that improves the objective function most when it is merged with the cluster
+
+        :param cid: number of cluster
+        :param neighborhood: an instance of Neighborhood
+        :return: the best cluster and the change of the objective function value, (-1, 0) if no merge is better
+        """
+
+        min_delta = 0
+        candidate = -1
+        for nbr_cluster in neighborhood.get_adjacent_cluster_of_cluster(cid, self.solution, self.partition):
+            delta = self.delta_caused_by_merge(cid, nbr_cluster, neighborhood.neighborhood_structure)
+            if delta < min_delta:
+                min_delta = delta
+                candidate = nbr_cluster
+
+        return candidate, min_delta
+
+    def decompose(self, node, delta, force=False):
         pass
 
     def delta_caused_by_decompose(self, node, neighborhood):
@@ -0,0 +1,135 @@
+# encoding: utf-8
+import random as rd
+import numpy as np
+
+
+class WeightedSampler:
+    """
+    The class of a weighted sampler without replacement.
+    The weights are stored in a Fenwick tree, so a draw and an update of a weight both cost O(log n).
+
+    keys: the items, each item is drawn with a probability proportional to its weight
+    tree: the Fenwick tree of the weights
+    """
+
+    def __init__(self, weights: dict):
+        """
+        class initialization
+
+        :param weights: {item: weight}, a weight is expected to be non-negative
+        """
+
+        self.keys = list(weights.keys())
+        self.position = {key: i for i, key in enumerate(self.keys)}
+        self.weights = np.array([max(w, 0) for w in weights.values()], dtype=np.float64)
+        self.size = len(self.keys)
+        self.tree = None
+        self.__build()
+        self.mask = 1 << (self.size.bit_length() - 1) if self.size else 0
+
+    def __build(self):
+        # a Fenwick tree built in O(n), also clears the rounding errors left by the updates
+        self.tree = np.concatenate(([0.0], self.weights))
+        for i in range(1, self.size + 1):
+            parent = i + (i & -i)
+            if parent <= self.size:
+                self.tree[parent] += self.tree[i]
+
+    def __len__(self):
+        return self.size
+
+    @property
+    def total(self):
+        """
+        :return: sum of the weights
+        """
+
+        total, i = 0.0, self.size
+        while i > 0:
+            total += self.tree[i]
+            i -= i & -i
+        return total
+
+    def update(self, key, weight):
+        """
+        change the weight of an item in place
+
+        :param key: an item given at initialization
+        :param weight: the new weight, non-negative
+        :return: None
+        """
+
+        i = self.position[key]
+        diff = max(weight, 0) - self.weights[i]
+        if diff == 0:
+            return
+        self.weights[i] += diff
+        i += 1
+        while i <= self.size:
+            self.tree[i] += diff
+            i += i & -i
+
+    def __find(self, target):
+        # the first position whose prefix sum is larger than target
+        i, bit = 0, self.mask
+        while bit:
+            j = i + bit
+            if j <= self.size and self.tree[j] <= target:
+                i = j
+                target -= self.tree[j]
+            bit >>= 1
+        return min(i, self.size - 1)
+
+    def sample(self, k: int, rng=rd) -> list:
+        """
+        draw k different items, the weights are left unchanged
+
+        :param k: number of items, all the items with positive weights are returned if k is larger
+        :param rng: the random generator, an instance of random.Random or the module random
+        :return: a list of items
+        """
+
+        # the sum of the weights left is not exactly 0 after all the items are drawn, so the count is fixed first
+        k = min(k, int(np.count_nonzero(self.weights > 0)))
+        chosen = []
+        removed = []
+        while len(chosen) < k:
+            i = self.__find(rng.random() * self.total)
+            if self.weights[i] <= 0:
+                # rounding error of the prefix sums, they are summed again
+                self.__build()
+                continue
+            chosen.append(self.keys[i])
+            removed.append((self.keys[i], self.weights[i]))
+            self.update(self.keys[i], 0)
+
+        for key, weight in removed:
+            self.update(key, weight)
+        return chosen
+
+
+def weighted_sample(weights: dict, k: int, rng=None) -> list:
+    """
+    draw k different items with probabilities proportional to the weights in one vectorized pass,
+    by the method of Efraimidis and Spirakis: the items with the k largest u^(1/w) are chosen
+
+    :param weights: {item: weight}, the items with non-positive weights are never chosen
+    :param k: number of items, all the items with positive weights are returned if k is larger
+    :param rng: an instance of numpy.random.Generator, default: seeded by the module random
+    :return: a list of items
+    """
+
+    keys = [key for key, w in weights.items() if w > 0]
+    if k <= 0 or not keys:
+        return []
+    if k >= len(keys):
+        return keys
+    if rng is None:
+        # follow random.seed() like the rest of the algorithm
+        rng = np.random.default_rng(rd.getrandbits(64))
+
+    w = np.fromiter((weights[key] for key in keys), dtype=np.float64, count=len(keys))
+    # log(u) / w keeps the order of u^(1/w) without underflow
+    scores = np.log(rng.random(len(keys))) / w
+    chosen = np.argpartition(-scores, k - 1)[:k]
+    return [keys[i] for i in chosen.tolist()]
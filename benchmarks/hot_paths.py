@@ -0,0 +1,240 @@
+import io
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import tempfile
+import contextlib
+import subprocess
+import statistics
+import numpy as np
+import random as rd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from balance import *
+from common.file_operations import FileOperations
+from common.generate_random_signed_network import generate_signed_networks, write_lfr_signed_network
+from algorithm.iterated_greedy_algorithm import IteratedGreedy
+from robustness.centrality import Centrality
+from robustness.dynamic_attack import DynamicAttack
+from robustness.attack_events import NullSink
+
+
+"""
+Micro-benchmarks of the hot paths of balance and robustness.
+The graphs are generated by generate_signed_networks (or the LFR-style generator with power-law degrees) with fixed
+seeds at several sizes, every case is timed a few times on fresh state, and the results are written as JSON, so that
+runs on different commits can be compared.
+
+usage:
+    python benchmarks/hot_paths.py --sizes 1000 5000 --repeat 3 --output results/bench.json
+    python benchmarks/hot_paths.py --model lfr --sizes 10000 --only ig_iteration attack_step
+"""
+
+CENTRALITIES = {
+    'random': Centrality.RANDOM,
+    'node_frustration': Centrality.NODE_FRUSTRATION,
+    'betweenness': Centrality.BETWEENNESS,
+    'degree': Centrality.DEGREE,
+    'r_degree': Centrality.R_DEGREE,
+    'page_rank': Centrality.PAGE_RANK
+}
+
+# exact betweenness above this number of nodes is replaced by sampled betweenness
+EXACT_BETWEENNESS_LIMIT = 2000
+PIVOTS = 256
+
+
+def measure(fn, setup=None, repeat=3, seed=0):
+    """
+    :param fn: the case, called with the result of setup
+    :param setup: optional, prepares fresh state before each run, not timed
+    :param repeat: number of runs
+    :param seed: the random seed before each run
+    :return: the times in seconds
+    """
+
+    times = []
+    for _ in range(repeat):
+        rd.seed(seed)
+        np.random.seed(seed)
+        state = setup() if setup is not None else None
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            fn(state)
+            times.append(time.perf_counter() - start)
+    return times
+
+
+def generate(size, seed, clusters=10, k=12, pin=0.8, pn=0.1, pp=0.1):
+    rd.seed(seed)
+    np.random.seed(seed)
+    with contextlib.redirect_stdout(io.StringIO()):
+        return generate_signed_networks(c=clusters, n=max(size // clusters, 1), k=k, pin=pin, pn=pn, pp=pp)
+
+
+def generate_file(model, size, seed, directory):
+    """
+    :param model: enum {"cluster", "lfr"}
+    :return: the file path of the generated graph
+    """
+    path = os.path.join(directory, 'bench_{0}_{1}.g'.format(model, size))
+    if model == 'lfr':
+        # the default community sizes are capped for the small graphs
+        return quiet(write_lfr_signed_network, path, size, seed=seed, min_community=min(50, size),
+                     max_community=min(250, size))[0]
+    return quiet(FileOperations.dataset2g, generate(size, seed), path)
+
+
+def quiet(fn, *args, **kwargs):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return fn(*args, **kwargs)
+
+
+def solved_algorithm(dataset):
+    """
+    an IG with an initial partition, the start point of the local search cases
+    """
+
+    alg = quiet(IteratedGreedy, dataset)
+    quiet(alg.initialization, output=False)
+    return alg
+
+
+def cases(dataset, path, size, warm_options=None):
+    """
+    :param warm_options: optional, hops, refine_iter and restart_iter of the warm-started attack, see NetworkAttack
+    :return: a generator of (name, fn, setup)
+    """
+
+    compact = quiet(FileOperations.load_data, path, compact=True, cache=False)
+    yield 'load_data', lambda _: FileOperations.load_data(path, cache=False), None
+    yield 'load_data_cached', lambda _: FileOperations.load_data(path), lambda: quiet(FileOperations.load_data, path)
+    yield 'load_data_compact', lambda _: FileOperations.load_data(path, compact=True, cache=False), None
+    yield 'neighborhood', lambda _: Neighborhood(dataset), None
+    yield 'neighborhood_compact', lambda _: Neighborhood(compact), None
+    yield 'ig_initialization', lambda alg: alg.initialization(output=False), lambda: quiet(IteratedGreedy, dataset)
+    yield 'local_move', lambda alg: alg.local_search.local_move(), lambda: solved_algorithm(dataset)
+    yield 'community_merge', lambda alg: alg.local_search.community_merge(), lambda: solved_algorithm(dataset)
+    yield 'ig_iteration', lambda alg: alg.iterate(), lambda: solved_algorithm(dataset)
+
+    for name, centrality in CENTRALITIES.items():
+        options = {}
+        if centrality == Centrality.BETWEENNESS and size > EXACT_BETWEENNESS_LIMIT:
+            options = {'pivots': PIVOTS, 'seed': 0}
+            name += '_{0}_pivots'.format(PIVOTS)
+
+        def setup(centrality=centrality, options=options):
+            # a new instance each time, so that the centrality is not read from the cache
+            helper = Centrality(centrality, **options)
+            if centrality in {Centrality.NODE_FRUSTRATION, Centrality.DEGREE, Centrality.R_DEGREE}:
+                alg = solved_algorithm(dataset)
+                return helper, {'partition': alg.objective_function.partition,
+                                'neighbor_structure': alg.neighborhood.neighborhood_structure,
+                                'objective_function': alg.objective_function}
+            return helper, dataset
+        yield 'centrality_' + name, lambda state: state[0].get_centrality_of_nodes(state[1]), setup
+
+    def attack_setup(warm_start):
+        ds = compact.to_dynamic(copy=True)
+        attack = DynamicAttack(ds, Centrality.DEGREE, warm_start=warm_start, sink=NullSink(), **(warm_options or {}))
+        alg = quiet(attack.solve)
+        return attack, alg
+
+    def attack_step(state):
+        attack, alg = state
+        node = attack.pick_next(alg=alg)
+        attack.attack_node(node)
+        attack.solve(max_iter=20)
+
+    yield 'attack_step', attack_step, lambda: attack_setup(False)
+    yield 'attack_step_warm_start', attack_step, lambda: attack_setup(True)
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(sizes, repeat=3, seed=0, only=None, model='cluster', warm_options=None) -> dict:
+    """
+    :param sizes: numbers of nodes
+    :param repeat: number of runs of each case
+    :param seed: the random seed of the graphs and the cases
+    :param only: optional, names of the cases to run
+    :param model: the generator of the graphs, enum {"cluster", "lfr"}
+    :param warm_options: optional, see cases()
+    :return: a JSON-serializable report
+    """
+
+    report = {
+        'meta': {
+            'commit': git_commit(),
+            'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'machine': platform.machine(),
+            'cpu_count': os.cpu_count(),
+            'seed': seed,
+            'repeat': repeat,
+            'model': model,
+            'warm_options': warm_options or {}
+        },
+        'results': []
+    }
+
+    with tempfile.TemporaryDirectory() as directory:
+        for size in sizes:
+            path = generate_file(model, size, seed, directory)
+            dataset = quiet(FileOperations.load_data, path)
+            for name, fn, setup in cases(dataset, path, size, warm_options):
+                if only and name not in only:
+                    continue
+                times = measure(fn, setup, repeat=repeat, seed=seed)
+                report['results'].append({
+                    'case': name,
+                    'size': size,
+                    'vnum': dataset.vnum,
+                    'enum': dataset.enum,
+                    'min': min(times),
+                    'median': statistics.median(times),
+                    'times': times
+                })
+                print('{0:>8} {1:<40} {2:.4f}s'.format(size, name, min(times)), file=sys.stderr)
+
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='benchmark the hot paths of balance and robustness')
+    parser.add_argument('--sizes', nargs='+', type=int, default=[1000, 5000])
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--only', nargs='+', default=None, help='names of the cases to run')
+    parser.add_argument('--model', choices=['cluster', 'lfr'], default='cluster', help='the generator of the graphs')
+    parser.add_argument('--hops', type=int, default=None, help='see NetworkAttack, for the warm-started attack')
+    parser.add_argument('--refine-iter', type=int, default=None, help='see NetworkAttack')
+    parser.add_argument('--restart-iter', type=int, default=None, help='see NetworkAttack')
+    parser.add_argument('--output', default=None, help='file path of the JSON report, default: stdout')
+    args = parser.parse_args(argv)
+
+    warm_options = {name: value for name, value in [('hops', args.hops), ('refine_iter', args.refine_iter),
+                                                    ('restart_iter', args.restart_iter)] if value is not None}
+    report = run(args.sizes, repeat=args.repeat, seed=args.seed, only=args.only, model=args.model,
+                 warm_options=warm_options)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text)
+    else:
+        print(text)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+# encoding: utf-8
+
+import os
+import json
+import shutil
+import numpy as np
+
+
+"""
+A binary cache of parsed datasets.
+The arrays of a CompactDataset are stored as raw .npy files in a directory next to the dataset,
+e.g. H97.g -> H97.g.sgcache/, and they are opened with mmap when the dataset is loaded again.
+The cache is keyed by the path, size and mtime of the dataset file, so an edited file is parsed again.
+"""
+
+CACHE_SUFFIX = '.sgcache'
+CACHE_VERSION = 1
+META_FILE = 'meta.json'
+ARRAYS = ('indptr', 'indices', 'signs', 'mirror')
+
+
+def cache_path(path: str) -> str:
+    return path + CACHE_SUFFIX
+
+
+def cache_key(path: str, network_type: str, header: bool) -> dict:
+    """
+    :param path: file path of the dataset
+    :return: everything that decides whether a cache is still valid
+    """
+
+    stat = os.stat(path)
+    return {
+        'version': CACHE_VERSION,
+        'path': os.path.abspath(path),
+        'size': stat.st_size,
+        'mtime': stat.st_mtime_ns,
+        'network_type': network_type,
+        'header': bool(header)
+    }
+
+
+def load_cache(path: str, network_type='signed', header=True):
+    """
+    open the cached arrays of a dataset with mmap
+
+    :param path: file path of the dataset
+    :return: an instance of class CompactDataset, None if there is no valid cache
+    """
+
+    from common.signed_graph import CompactDataset
+
+    directory = cache_path(path)
+    try:
+        with open(os.path.join(directory, META_FILE)) as f:
+            meta = json.load(f)
+        if meta['key'] != cache_key(path, network_type, header):
+            return None
+        # copy-on-write, so that a dynamic dataset can change signs without touching the cache
+        arrays = {name: np.load(os.path.join(directory, name + '.npy'), mmap_mode='c') for name in ARRAYS}
+    except (OSError, ValueError, KeyError):
+        return None
+
+    return CompactDataset(arrays['indptr'], arrays['indices'], arrays['signs'], mirror=arrays['mirror'],
+                          vnum=meta['vnum'], enum=meta['enum'])
+
+
+def save_cache(path: str, dataset, network_type='signed', header=True) -> bool:
+    """
+    write the arrays of a dataset next to the dataset file, an existing cache is replaced
+
+    :param path: file path of the dataset
+    :param dataset: an instance of class CompactDataset
+    :return: True if the cache is written
+    """
+
+    directory = cache_path(path)
+    temp = directory + '.tmp' + str(os.getpid())
+    meta = {
+        'key': cache_key(path, network_type, header),
+        'vnum': int(dataset.vnum),
+        'enum': int(dataset.enum)
+    }
+
+    try:
+        os.makedirs(temp, exist_ok=True)
+        for name in ARRAYS:
+            np.save(os.path.join(temp, name + '.npy'), np.ascontiguousarray(getattr(dataset, name)))
+        with open(os.path.join(temp, META_FILE), 'w') as f:
+            json.dump(meta, f)
+        if os.path.exists(directory):
+            shutil.rmtree(directory)
+        os.replace(temp, directory)
+    except OSError as e:
+        # e.g. the dataset is in a read-only directory, or another process wrote the cache first
+        print('The dataset cache is not written:', e)
+        shutil.rmtree(temp, ignore_errors=True)
+        return False
+
+    return True
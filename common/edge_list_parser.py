@@ -0,0 +1,207 @@
+# encoding: utf-8
+
+import os
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+
+
+"""
+A bulk parser of edge lists in the form of "n1 n2 attr".
+The file is decoded in large byte chunks with numpy instead of splitting it line by line,
+and a large file can be cut into byte ranges that are parsed by a process pool.
+"""
+
+DEFAULT_CHUNK_SIZE = 1 << 23
+
+# the class of the attribute of an edge
+POSITIVE, NEGATIVE, ZERO, UNKNOWN = 1, -1, 0, 2
+
+_POW10 = 10 ** np.arange(19, dtype=np.int64)
+
+
+def _code(token: bytes) -> int:
+    # the first four bytes of a token padded with spaces, as an integer
+    token = token.ljust(4)
+    return token[0] | token[1] << 8 | token[2] << 16 | token[3] << 24
+
+
+_ATTR_CLASS = {
+    _code(b'1'): POSITIVE,
+    _code(b'1.0'): POSITIVE,
+    _code(b'-1'): NEGATIVE,
+    _code(b'-1.0'): NEGATIVE,
+    _code(b'0'): ZERO
+}
+
+
+class EdgeList:
+    """
+    the edges of a network stored by arrays
+
+    src, dst: the two ends of each edge, np.int64
+    signs: the sign of each edge, np.int8, or the class of the attribute if the edges are not filtered
+    vnum, enum: the header of the file, None if there is no header
+    min_id, max_id: the smallest and the largest id among the edges
+    """
+
+    def __init__(self, src, dst, signs, vnum=None, enum=None):
+        self.src = src
+        self.dst = dst
+        self.signs = signs
+        self.vnum = vnum
+        self.enum = enum
+        self.min_id = int(min(src.min(), dst.min())) if len(src) else None
+        self.max_id = int(max(src.max(), dst.max())) if len(src) else None
+
+    def __len__(self):
+        return len(self.src)
+
+    def starts_with_one(self) -> bool:
+        """
+        the same test as FileOperations.load_data, the ids may start with 1 if they cover [1, vnum]
+        """
+
+        return self.min_id == 1 and self.max_id == self.vnum
+
+    def shift(self, offset=-1):
+        self.src += offset
+        self.dst += offset
+        self.min_id += offset
+        self.max_id += offset
+
+
+def parse_block(block: bytes, signed_only=True):
+    """
+    parse a block of complete lines
+
+    :param block: bytes, ended with a newline or the end of the file
+    :param signed_only: keep only the edges with attr in {1, -1, 1.0, -1.0}
+    :return: src, dst, signs (or the classes of the attributes if signed_only is False)
+    """
+
+    buf = np.frombuffer(block, dtype=np.uint8)
+    # spaces, tabs, carriage returns and newlines are all separators
+    is_token = np.concatenate(([False], buf > 32, [False]))
+    starts = np.flatnonzero(is_token[1:] & ~is_token[:-1])
+    ends = np.flatnonzero(is_token[:-1] & ~is_token[1:])
+
+    # each line is expected in the form of "n1 n2 attr"
+    line = np.cumsum(buf == ord('\n'), dtype=np.int32)[starts]
+    if len(starts) % 3 or (line[0::3] != line[2::3]).any() or (line[3::3] == line[2:-1:3]).any():
+        raise ValueError('each line is expected in the form of "n1 n2 attr"')
+
+    starts, length = starts.reshape(-1, 3), (ends - starts).reshape(-1, 3)
+    padded = np.concatenate((buf, np.full(4, ord(' '), dtype=np.uint8)))
+
+    # the ids: decoded digit by digit, an id with any other character is invalid
+    id_starts, id_length = starts[:, :2], length[:, :2]
+    value = np.zeros(id_starts.shape, dtype=np.int64)
+    valid = id_length < len(_POW10)
+    for k in range(int(id_length.max(initial=0))):
+        active = id_length > k
+        digit = padded[np.minimum(id_starts + k, len(buf))].astype(np.int64) - ord('0')
+        valid &= ~active | ((digit >= 0) & (digit <= 9))
+        value = np.where(active, value * 10 + digit, value)
+
+    # the attributes: compared with the accepted literals by their first four bytes
+    attr_starts, attr_length = starts[:, 2], length[:, 2]
+    code = np.zeros(len(attr_starts), dtype=np.int64)
+    for k in range(4):
+        byte = np.where(attr_length > k, padded[attr_starts + k], ord(' ')).astype(np.int64)
+        code |= byte << (8 * k)
+    code[attr_length > 4] = -1
+    attr_class = np.full(len(code), UNKNOWN, dtype=np.int8)
+    for literal, cls in _ATTR_CLASS.items():
+        attr_class[code == literal] = cls
+
+    src, dst, valid_id = value[:, 0], value[:, 1], valid[:, 0] & valid[:, 1]
+    if signed_only:
+        keep = (attr_class == POSITIVE) | (attr_class == NEGATIVE)
+        src, dst, attr_class, valid_id = src[keep], dst[keep], attr_class[keep], valid_id[keep]
+    if not valid_id.all():
+        raise ValueError('invalid node id in the edge list')
+
+    return src, dst, attr_class
+
+
+def parse_range(path: str, start: int, end: int, signed_only=True, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    parse the lines in the byte range [start, end) of a file, the range is expected to be aligned with lines
+
+    :return: src, dst, signs
+    """
+
+    parts = []
+    rest = b''
+    with open(path, 'rb') as f:
+        f.seek(start)
+        remaining = end - start
+        while remaining > 0:
+            chunk = f.read(min(chunk_size, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            block = rest + chunk
+            cut = block.rfind(b'\n') + 1 if remaining > 0 else len(block)
+            rest = block[cut:]
+            if cut:
+                parts.append(parse_block(block[:cut], signed_only=signed_only))
+
+    if not parts:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int8)
+    return tuple(np.concatenate(arrays) for arrays in zip(*parts))
+
+
+def _parse_range_task(args):
+    return parse_range(*args)
+
+
+def split_ranges(path: str, start: int, parts: int) -> list:
+    """
+    cut [start, end of file) into byte ranges that end with a newline
+
+    :return: a list of (start, end)
+    """
+
+    size = os.path.getsize(path)
+    bounds = [start]
+    with open(path, 'rb') as f:
+        for i in range(1, parts):
+            f.seek(max(start + (size - start) * i // parts - 1, bounds[-1]))
+            f.readline()
+            bounds.append(max(f.tell(), bounds[-1]))
+    bounds.append(size)
+    return [(bounds[i], bounds[i + 1]) for i in range(parts) if bounds[i] < bounds[i + 1]]
+
+
+def parse_edge_list(path: str, header=True, signed_only=True, workers=1, chunk_size=DEFAULT_CHUNK_SIZE) -> EdgeList:
+    """
+    read an edge list in the form of "n1 n2 attr" with an optional header "vnum enum"
+
+    :param path: file path
+    :param header: whether the first line is the header
+    :param signed_only: keep only the edges with attr in {1, -1, 1.0, -1.0}
+    :param workers: number of processes, the file is cut into byte ranges if it is larger than 1
+    :param chunk_size: number of bytes decoded at a time
+    :return: an instance of class EdgeList, the edges are in the order of the file
+    """
+
+    vnum, enum = None, None
+    with open(path, 'rb') as f:
+        if header:
+            vnum, enum = f.readline().split()
+            vnum, enum = int(vnum), int(enum)
+        start = f.tell()
+
+    ranges = split_ranges(path, start, max(workers, 1))
+    tasks = [(path, s, e, signed_only, chunk_size) for s, e in ranges]
+    if workers > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_parse_range_task, tasks))
+    else:
+        results = [_parse_range_task(task) for task in tasks]
+
+    if not results:
+        results = [parse_range(path, start, start)]
+    src, dst, signs = (np.concatenate(arrays) for arrays in zip(*results))
+    return EdgeList(src, dst, signs, vnum=vnum, enum=enum)
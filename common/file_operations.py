@@ -3,6 +3,7 @@ import os
 import datetime
 import collections
 import numpy as np
+from common.edge_list_parser import EdgeList, parse_edge_list
 
 
 class Dataset:
@@ -12,8 +13,12 @@ class Dataset:
     vnum：num of vertices, int
     enum：num of edges, int
     dataset: a graph stored by adjacency table using hash, dict(dict())
+    topology_version: increased when nodes or edges are removed, the results that only depend on the topology
+                      (e.g. betweenness) are valid as long as it is unchanged
     """
 
+    topology_version = 0
+
     def __init__(self):
         self.vnum = 0
         self.enum = 0
@@ -47,6 +52,7 @@ class DynamicDataset(Dataset):
             del self.data[nbr][v]
 
         del self.data[v]
+        self.topology_version += 1
 
     @staticmethod
     def dataset2dynamic(dataset: Dataset):
@@ -60,19 +66,43 @@ class DynamicDataset(Dataset):
 class FileOperations:
 
     @staticmethod
-    def load_data(path: str, network_type='signed', header=True) -> Dataset:
+    def load_data(path: str, network_type='signed', header=True, compact=False, cache=True, workers=1) -> Dataset:
         """
         read data from a local file
 
         :param path: file path
         :param network_type: enum {"unsigned", "signed"}
+        :param compact: return an array-backed CompactDataset instead of a dict of dict
+        :param cache: reuse the binary cache next to the file (see common.dataset_cache), a dict of dict is then
+                      built from the cached arrays, so the file is only parsed when it is new or changed
+        :param workers: number of processes to parse a signed network (see common.edge_list_parser)
         :return: an instance of class Dataset
         """
 
+        if compact or cache:
+            dataset = FileOperations.load_compact_data(path, network_type=network_type, header=header, cache=cache,
+                                                       workers=workers)
+            return dataset if compact else dataset.to_dataset()
+
         dataset = Dataset()
         data = collections.defaultdict(lambda: collections.defaultdict(lambda: 0))
         print('Loading data from ' + path)
 
+        if network_type == 'signed':
+            # each line in the file is expected in the form of "n1 n2 attr"
+            # the signs are filtered and the ids starting with 1 are detected while parsing
+            edges = parse_edge_list(path, header=header, workers=workers)
+            if header:
+                dataset.vnum, dataset.enum = edges.vnum, edges.enum
+            if edges.starts_with_one():
+                print("The dataset may start with 1. The ids are shifted.")
+                edges.shift(-1)
+            for n1, n2, attr in zip(edges.src.tolist(), edges.dst.tolist(), edges.signs.tolist()):
+                data[n1][n2] = data[n2][n1] = attr
+            dataset.data = data
+            print('Loading complete!')
+            return dataset
+
         with open(path) as f:
             # the first line
             if header:
@@ -80,15 +110,7 @@ class FileOperations:
                 vnum, enum = first_line.split()
                 dataset.vnum, dataset.enum = int(vnum), int(enum)
             # the remaining
-            if network_type == 'signed':
-                # each line in the file is expected in the form of "n1 n2 attr"
-                for each in f:
-                    n1, n2, attr = each.split()
-                    if attr != '1' and attr != '-1' and attr != '1.0' and attr != '-1.0':
-                        continue
-                    n1, n2 = int(n1), int(n2)
-                    data[n1][n2] = data[n2][n1] = 1 if attr in {"1", "1.0"} else -1
-            elif network_type == 'unsigned':
+            if network_type == 'unsigned':
                 # expected form: "n1 n2"
                 for each in f:
                     n1, n2 = each.split(",")
@@ -106,6 +128,58 @@ class FileOperations:
 
         return dataset
 
+    @staticmethod
+    def load_compact_data(path: str, network_type='signed', header=True, cache=True, workers=1):
+        """
+        read data from a local file into arrays, each edge is stored by 9 bytes in each direction
+
+        :param path: file path
+        :param network_type: enum {"unsigned", "signed"}
+        :param cache: open the cached arrays if the file is unchanged, otherwise parse the file and write the cache
+        :param workers: number of processes to parse a signed network
+        :return: an instance of class CompactDataset
+        """
+
+        from common.signed_graph import CompactDataset
+        import common.dataset_cache as dc
+
+        if cache:
+            dataset = dc.load_cache(path, network_type=network_type, header=header)
+            if dataset is not None:
+                print('Loading data from the cache of ' + path)
+                return dataset
+
+        print('Loading data from ' + path)
+
+        if network_type == 'signed':
+            edges = parse_edge_list(path, header=header, workers=workers)
+        elif network_type == 'unsigned':
+            vnum, enum = None, None
+            src, dst = [], []
+            with open(path) as f:
+                if header:
+                    vnum, enum = f.readline().split()
+                    vnum, enum = int(vnum), int(enum)
+                for each in f:
+                    n1, n2 = each.split(",")
+                    src.append(int(n1))
+                    dst.append(int(n2))
+            edges = EdgeList(np.array(src, dtype=np.int64), np.array(dst, dtype=np.int64),
+                             np.ones(len(src), dtype=np.int8), vnum=vnum, enum=enum)
+        else:
+            raise TypeError('no such type of network')
+
+        if edges.starts_with_one():
+            print("The dataset may start with 1. The ids are shifted.")
+            edges.shift(-1)
+
+        dataset = CompactDataset.from_edges(edges.src, edges.dst, edges.signs, vnum=edges.vnum, enum=edges.enum)
+        if cache:
+            dc.save_cache(path, dataset, network_type=network_type, header=header)
+        print('Loading complete!')
+
+        return dataset
+
     @staticmethod
     def load_data_with_start_one(path: str, network_type='signed') -> Dataset:
         """
@@ -134,16 +208,9 @@ class FileOperations:
         return dataset
 
     @staticmethod
-    def load_data_native(path: str) -> list:
-        dataset = []
-        with open(path) as f:
-            f.readline()
-            for each in f:
-                n1, n2, attr = each.split()
-                if attr != '1' and attr != '-1':
-                    continue
-                n1, n2 = int(n1), int(n2)
-                dataset.append([n1, n2, int(attr)])
+    def load_data_native(path: str, workers=1) -> list:
+        edges = parse_edge_list(path, workers=workers)
+        dataset = np.column_stack((edges.src, edges.dst, edges.signs)).tolist()
 
         return dataset
 
@@ -1,4 +1,5 @@
 import collections
+import numpy as np
 import random as rd
 from common.file_operations import Dataset, FileOperations
 
@@ -40,14 +41,14 @@ def generate_signed_networks(c, n: int or list, k, pin, pn, pp) -> Dataset:
         # add negative edges within clusters
         for _ in range(negative_edges_in_cluster):
             n1, n2 = rd.sample(range(start_id[i], start_id[i + 1]), 2)
-            while g[n1][n2] != 0:
+            while n2 in g[n1]:
                 n1, n2 = rd.sample(range(start_id[i], start_id[i + 1]), 2)
             g[n1][n2] = g[n2][n1] = -1
 
         # add positive edges within clusters
         for _ in range(edges_in_cluster - negative_edges_in_cluster):
             n1, n2 = rd.sample(range(start_id[i], start_id[i + 1]), 2)
-            while g[n1][n2] != 0:
+            while n2 in g[n1]:
                 n1, n2 = rd.sample(range(start_id[i], start_id[i + 1]), 2)
             g[n1][n2] = g[n2][n1] = 1
 
@@ -62,7 +63,7 @@ def generate_signed_networks(c, n: int or list, k, pin, pn, pp) -> Dataset:
             c1, c2 = rd.sample(range(c), 2)
         n1 = rd.choice(range(start_id[c1], start_id[c1 + 1]))
         n2 = rd.choice(range(start_id[c2], start_id[c2 + 1]))
-        while g[n1][n2] != 0:
+        while n2 in g[n1]:
             c1, c2 = rd.sample(range(c), 2)
             while c1 == c2:
                 c1, c2 = rd.sample(range(c), 2)
@@ -76,7 +77,7 @@ def generate_signed_networks(c, n: int or list, k, pin, pn, pp) -> Dataset:
             c1, c2 = rd.sample(range(c), 2)
         n1 = rd.choice(range(start_id[c1], start_id[c1 + 1]))
         n2 = rd.choice(range(start_id[c2], start_id[c2 + 1]))
-        while g[n1][n2] != 0:
+        while n2 in g[n1]:
             c1, c2 = rd.sample(range(c), 2)
             while c1 == c2:
                 c1, c2 = rd.sample(range(c), 2)
@@ -91,6 +92,396 @@ def generate_signed_networks(c, n: int or list, k, pin, pn, pp) -> Dataset:
     return dataset
 
 
+def cluster_bounds(c, n: int or list) -> np.array:
+    """
+    :param c: number of clusters
+    :param n: number of nodes in each cluster, int or list
+    :return: the first node of each cluster and the end, an int64 array of length c + 1
+    """
+    sizes = np.full(c, n, dtype=np.int64) if isinstance(n, int) else np.asarray(n, dtype=np.int64)
+    start = np.zeros(len(sizes) + 1, dtype=np.int64)
+    np.cumsum(sizes, out=start[1:])
+    return start
+
+
+def _unique_in_order(keys: np.array) -> np.array:
+    """
+    :return: the positions of the first occurrence of each key, in the order of keys
+    """
+    _, first = np.unique(keys, return_index=True)
+    first.sort()
+    return first
+
+
+def intra_cluster_edges(rng, start, counts, pn) -> (np.array, np.array, np.array):
+    """
+    sample distinct edges within the clusters, counts[i] edges in cluster i, int(counts[i] * pn) of them negative
+
+    :param rng: a numpy random generator
+    :param start: the first node of each cluster and the end, see cluster_bounds()
+    :param counts: number of edges in each cluster
+    :param pn: the ratio of negative edges within clusters
+    :return: src, dst and signs, src < dst
+    """
+
+    sizes = np.diff(start)
+    counts = np.asarray(counts, dtype=np.int64)
+    if np.any(counts > sizes * (sizes - 1) // 2):
+        raise ValueError('a cluster is too small for its edges')
+    vnum = int(start[-1])
+    keys = np.zeros(0, dtype=np.int64)
+    missing = counts.copy()
+
+    while missing.sum() > 0:
+        # oversample the clusters still short of edges, the repeated pairs and loops are dropped below
+        draw = np.where(missing > 0, missing + missing // 8 + 8, 0)
+        cluster = np.repeat(np.arange(len(sizes)), draw)
+        a = rng.integers(0, sizes[cluster])
+        b = rng.integers(0, sizes[cluster])
+        keep = a != b
+        lo = np.minimum(a, b)[keep] + start[cluster[keep]]
+        hi = np.maximum(a, b)[keep] + start[cluster[keep]]
+        keys = np.concatenate([keys, lo * vnum + hi])
+        keys = keys[_unique_in_order(keys)]
+
+        # keep the first counts[i] edges of each cluster in the order of sampling
+        cluster = np.searchsorted(start, keys // vnum, side='right') - 1
+        order = np.argsort(cluster, kind='stable')
+        group_start = np.searchsorted(cluster[order], np.arange(len(sizes)))
+        rank = np.empty(len(keys), dtype=np.int64)
+        rank[order] = np.arange(len(keys)) - group_start[cluster[order]]
+        keep = rank < counts[cluster]
+        keys, rank, cluster = keys[keep], rank[keep], cluster[keep]
+        missing = counts - np.bincount(cluster, minlength=len(sizes))
+
+    signs = np.where(rank < (counts * pn).astype(np.int64)[cluster], -1, 1).astype(np.int8)
+    return keys // vnum, keys % vnum, signs
+
+
+def inter_cluster_edges(rng, start, count, pp) -> (np.array, np.array, np.array):
+    """
+    sample distinct edges between clusters: a pair of different clusters is drawn uniformly, then a node in each,
+    int(count * pp) of them are positive
+
+    :param rng: a numpy random generator
+    :param start: the first node of each cluster and the end, see cluster_bounds()
+    :param count: number of edges
+    :param pp: the ratio of positive edges between clusters
+    :return: src, dst and signs, src < dst
+    """
+
+    sizes = np.diff(start)
+    c = len(sizes)
+    vnum = int(start[-1])
+    if count > 0 and (c < 2 or count > (vnum * vnum - int((sizes * sizes).sum())) // 2):
+        raise ValueError('too many edges between clusters')
+    keys = np.zeros(0, dtype=np.int64)
+
+    while len(keys) < count:
+        draw = count - len(keys)
+        draw += draw // 8 + 8
+        c1 = rng.integers(0, c, size=draw)
+        c2 = (c1 + rng.integers(1, c, size=draw)) % c
+        n1 = start[c1] + rng.integers(0, sizes[c1])
+        n2 = start[c2] + rng.integers(0, sizes[c2])
+        keys = np.concatenate([keys, np.minimum(n1, n2) * vnum + np.maximum(n1, n2)])
+        keys = keys[_unique_in_order(keys)][:count]
+
+    signs = np.full(count, -1, dtype=np.int8)
+    signs[rng.choice(count, int(count * pp), replace=False)] = 1
+    return keys // vnum, keys % vnum, signs
+
+
+def signed_network_edges(c, n: int or list, k, pin, pn, pp, seed=None, batch=1 << 20):
+    """
+    the model of generate_signed_networks() sampled with numpy, without repeated edges, batch by batch
+    The clusters are sampled in groups of about batch edges, so only the edges between clusters are held at once.
+
+    :param c: number of clusters, int
+    :param n: number of nodes in each cluster, int or list
+    :param k: degree of each node
+    :param pin: the ratio of edges within clusters
+    :param pn: the ratio of negative edges within clusters
+    :param pp: the ratio of positive edges between clusters
+    :param seed: optional, the seed of numpy, default: drawn from the module random
+    :param batch: the number of edges of each batch, about
+    :return: a generator of (src, dst, signs), each undirected edge is given once
+    """
+
+    start = cluster_bounds(c, n)
+    counts, inter = signed_network_size(c, n, k, pin)[1:]
+    # follow random.seed() like the rest of the algorithm
+    rng = np.random.default_rng(rd.getrandbits(64) if seed is None else seed)
+
+    first = 0
+    while first < c:
+        last = first + 1
+        total = counts[first]
+        while last < c and total + counts[last] <= batch:
+            total += counts[last]
+            last += 1
+        src, dst, signs = intra_cluster_edges(rng, start[first:last + 1], counts[first:last], pn)
+        yield src, dst, signs
+        first = last
+
+    src, dst, signs = inter_cluster_edges(rng, start, inter, pp)
+    for i in range(0, inter, batch):
+        yield src[i:i + batch], dst[i:i + batch], signs[i:i + batch]
+
+
+def signed_network_size(c, n: int or list, k, pin) -> (int, np.array, int):
+    """
+    the number of edges of the model, the same as generate_signed_networks()
+
+    :return: number of edges, number of edges within each cluster, number of edges between clusters
+    """
+    sizes = np.diff(cluster_bounds(c, n))
+    k = k // 2
+    counts = np.array([int(size * pin * k) for size in sizes.tolist()], dtype=np.int64)
+    inter = int(int(sizes.sum()) * k * (1 - pin))
+    return int(counts.sum()) + inter, counts, inter
+
+
+def generate_signed_network_arrays(c, n: int or list, k, pin, pn, pp, seed=None) -> (np.array, np.array, np.array):
+    """
+    see signed_network_edges()
+
+    :return: src, dst and signs of all the edges, each undirected edge is given once
+    """
+    batches = list(signed_network_edges(c, n, k, pin, pn, pp, seed=seed))
+    return tuple(np.concatenate([edges[i] for edges in batches]) for i in range(3))
+
+
+def generate_compact_signed_network(c, n: int or list, k, pin, pn, pp, seed=None):
+    """
+    see signed_network_edges()
+
+    :return: an instance of CompactDataset
+    """
+    from common.signed_graph import CompactDataset
+
+    src, dst, signs = generate_signed_network_arrays(c, n, k, pin, pn, pp, seed=seed)
+    vnum = int(cluster_bounds(c, n)[-1])
+    return CompactDataset.from_edges(src, dst, signs, vnum=vnum, enum=len(src))
+
+
+def write_signed_network(file_name, c, n: int or list, k, pin, pn, pp, seed=None, batch=1 << 20):
+    """
+    sample a network by signed_network_edges() and stream it to a file in the format of FileOperations.load_data(),
+    each undirected edge is written once
+
+    :param file_name: file path
+    :return: file_name
+    """
+
+    vnum = int(cluster_bounds(c, n)[-1])
+    enum = signed_network_size(c, n, k, pin)[0]
+    return write_edges(file_name, vnum, enum, signed_network_edges(c, n, k, pin, pn, pp, seed=seed, batch=batch))
+
+
+def write_edges(file_name, vnum, enum, batches):
+    """
+    write batches of edges to a file in the format of FileOperations.load_data(), each undirected edge once
+
+    :param file_name: file path
+    :param vnum: number of nodes
+    :param enum: number of edges
+    :param batches: an iterable of (src, dst, signs)
+    :return: file_name
+    """
+
+    with open(file_name, 'w') as f:
+        f.write('{0}\t{1}\n'.format(vnum, enum))
+        for src, dst, signs in batches:
+            np.savetxt(f, np.column_stack([src, dst, signs]), fmt='%d', delimiter='\t')
+
+    print('-> The dataset is write as ' + file_name)
+    return file_name
+
+
+def power_law_sample(rng, size, exponent, low, high) -> np.array:
+    """
+    draw integers from a power law p(x) ~ x^(-exponent) truncated to [low, high] by the inverse transform
+    The continuous values are rounded up or down at random, so the mean of the integers is that of the power law.
+
+    :param rng: a numpy random generator
+    :param size: number of samples
+    :param exponent: the exponent, larger than 1
+    :param low: the smallest value, not necessarily an integer
+    :param high: the largest value
+    :return: an int64 array
+    """
+    a, b = low ** (1 - exponent), high ** (1 - exponent)
+    x = (a + rng.random(size) * (b - a)) ** (1 / (1 - exponent))
+    return np.floor(x + rng.random(size)).astype(np.int64)
+
+
+def power_law_minimum(mean, exponent, high) -> float:
+    """
+    the lower end of a continuous power law truncated at high whose mean is the given one, found by bisection
+    """
+
+    def mean_of(low):
+        if abs(exponent - 2) < 1e-9:
+            return (high - low) / np.log(high / low)
+        return (exponent - 1) / (exponent - 2) * (low ** (2 - exponent) - high ** (2 - exponent)) / \
+            (low ** (1 - exponent) - high ** (1 - exponent))
+
+    lo, hi = 1.0, float(high)
+    for _ in range(100):
+        mid = (lo + hi) / 2
+        if mean_of(mid) < mean:
+            lo = mid
+        else:
+            hi = mid
+    return lo
+
+
+def _pair_stubs(rng, nodes, groups) -> (np.array, np.array):
+    """
+    the configuration model: the stubs of each group are shuffled and paired in turn, an odd stub is dropped
+
+    :param nodes: the node of each stub
+    :param groups: the group of each stub, only the stubs of the same group are paired
+    :return: the two ends of each pair
+    """
+    order = np.lexsort((rng.random(len(nodes)), groups))
+    nodes, groups = nodes[order], groups[order]
+    first = np.ones(len(groups), dtype=bool)
+    first[1:] = groups[1:] != groups[:-1]
+    group_start = np.maximum.accumulate(np.where(first, np.arange(len(groups)), 0))
+    rank = np.arange(len(groups)) - group_start
+    left = np.flatnonzero(rank % 2 == 0)
+    left = left[left + 1 < len(groups)]
+    left = left[groups[left + 1] == groups[left]]
+    return nodes[left], nodes[left + 1]
+
+
+def _configuration_edges(rng, stubs, groups, apart=None, rounds=4) -> np.array:
+    """
+    pair the stubs of the nodes into distinct edges, the stubs of the dropped pairs (loops, repeated edges) are paired
+    again for a few rounds, so that the degrees are kept in most cases
+
+    :param stubs: number of stubs of each node
+    :param groups: the group of each node, see _pair_stubs()
+    :param apart: optional, the community of each node, the pairs within a community are dropped
+    :param rounds: number of rounds
+    :return: the sorted keys (src * n + dst, src < dst) of the edges
+    """
+
+    n = len(stubs)
+    nodes = np.arange(n, dtype=np.int64)
+    keys = np.zeros(0, dtype=np.int64)
+    missing = stubs
+    for _ in range(rounds):
+        if missing.sum() < 2:
+            break
+        a, b = _pair_stubs(rng, np.repeat(nodes, missing), np.repeat(groups, missing))
+        keep = a != b
+        if apart is not None:
+            keep &= apart[a] != apart[b]
+        a, b = a[keep], b[keep]
+        keys = np.unique(np.concatenate([keys, np.minimum(a, b) * n + np.maximum(a, b)]))
+        degrees = np.bincount(keys // n, minlength=n) + np.bincount(keys % n, minlength=n)
+        missing = np.maximum(stubs - degrees, 0)
+    return keys
+
+
+def lfr_signed_edges(n, average_degree=20, max_degree=50, mu=0.2, tau1=2.5, tau2=1.5, min_community=50,
+                     max_community=250, pn=0.1, pp=0.1, seed=None) -> (np.array, np.array, np.array, np.array):
+    """
+    a signed network in the style of LFR benchmarks, vectorized with numpy
+        1. the degrees follow a power law with exponent tau1, the lower end is fit to average_degree
+        2. the community sizes follow a power law with exponent tau2 in [min_community, max_community]
+        3. each node has round((1 - mu) * degree) stubs inside its community, no more than the community allows,
+           and the rest outside, the stubs are paired by the configuration model without loops and repeated edges,
+           so the degrees can be a little lower than drawn
+        4. the edges within communities are negative with probability pn, those between positive with probability pp
+    Unlike LFR, the nodes are put into communities at random and the mixing is not rewired to be exact.
+
+    :param n: number of nodes
+    :param average_degree: the mean degree
+    :param max_degree: the largest degree
+    :param mu: the mixing parameter, the ratio of edges of a node to other communities
+    :param tau1: the exponent of degrees
+    :param tau2: the exponent of community sizes
+    :param min_community: the smallest community size
+    :param max_community: the largest community size
+    :param pn: the ratio of negative edges within communities
+    :param pp: the ratio of positive edges between communities
+    :param seed: optional, the seed of numpy, default: drawn from the module random
+    :return: src, dst and signs of the edges, each undirected edge given once with src < dst, and the community
+             of each node
+    """
+
+    if average_degree >= max_degree:
+        raise ValueError('average_degree must be smaller than max_degree')
+    if max_degree >= n:
+        raise ValueError('max_degree must be smaller than n')
+    if not 1 <= min_community <= max_community:
+        raise ValueError('min_community must be at least 1 and must not exceed max_community')
+    if max_community > n:
+        raise ValueError('max_community must not exceed n')
+    if not 0 <= mu <= 1:
+        raise ValueError('mu must be in [0, 1]')
+    # follow random.seed() like the rest of the algorithm
+    rng = np.random.default_rng(rd.getrandbits(64) if seed is None else seed)
+
+    low = power_law_minimum(average_degree, tau1, max_degree)
+    degrees = power_law_sample(rng, n, tau1, low, max_degree)
+
+    # enough community sizes to cover n nodes, the last one takes the remainder and is merged if too small
+    sizes = np.zeros(0, dtype=np.int64)
+    while sizes.sum() < n:
+        draw = int((n - sizes.sum()) / min_community) + 1
+        sizes = np.concatenate([sizes, power_law_sample(rng, draw, tau2, min_community, max_community)])
+    cut = int(np.searchsorted(np.cumsum(sizes), n))
+    sizes = sizes[:cut + 1]
+    sizes[-1] = n - sizes[:-1].sum()
+    if len(sizes) > 1 and sizes[-1] < min_community:
+        sizes[rng.integers(0, len(sizes) - 1)] += sizes[-1]
+        sizes = sizes[:-1]
+    communities = rng.permutation(np.repeat(np.arange(len(sizes)), sizes))
+
+    inner = np.minimum(np.rint((1 - mu) * degrees).astype(np.int64), sizes[communities] - 1)
+    outer = degrees - inner
+
+    # the edges within communities and those between are disjoint
+    keys = np.sort(np.concatenate([
+        _configuration_edges(rng, inner, communities),
+        _configuration_edges(rng, outer, np.zeros(n, dtype=np.int64), apart=communities)
+    ]))
+    src, dst = keys // n, keys % n
+
+    inside = communities[src] == communities[dst]
+    noise = rng.random(len(keys))
+    signs = np.where(inside, np.where(noise < pn, -1, 1), np.where(noise < pp, 1, -1)).astype(np.int8)
+    return src, dst, signs, communities
+
+
+def generate_lfr_signed_network(n, seed=None, **kwargs):
+    """
+    see lfr_signed_edges()
+
+    :return: an instance of CompactDataset and the community of each node
+    """
+    from common.signed_graph import CompactDataset
+
+    src, dst, signs, communities = lfr_signed_edges(n, seed=seed, **kwargs)
+    return CompactDataset.from_edges(src, dst, signs, vnum=n, enum=len(src)), communities
+
+
+def write_lfr_signed_network(file_name, n, seed=None, **kwargs):
+    """
+    sample a network by lfr_signed_edges() and write it to a file in the format of FileOperations.load_data()
+
+    :param file_name: file path
+    :return: file_name, the community of each node
+    """
+    src, dst, signs, communities = lfr_signed_edges(n, seed=seed, **kwargs)
+    return write_edges(file_name, n, len(src), [(src, dst, signs)]), communities
+
+
 # 8 [1761, 1747, 1735, 1732, 1732, 1732, 1732, 1732, 1732, 1732, 1732, 1732, 1732, 1731, 1731, 1731, 1731, 1731, 1731, 1731, 1731, 1731, 1731, 1731, 1731, 1731, 1731, 1730, 1730, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729, 1729]
 # 13 [2345, 2331, 2328, 2323, 2323, 2321, 2320, 2320, 2320, 2320, 2319, 2318, 2317, 2317, 2317, 2317, 2317, 2317, 2317, 2317, 2316, 2316, 2316, 2316, 2316, 2316, 2316, 2316, 2316, 2316, 2316, 2316, 2316, 2316, 2316, 2316, 2316, 2316, 2316, 2316, 2316, 2316, 2316, 2316, 2316, 2316, 2316, 2316, 2316, 2316, 2316, 2316, 2316, 2316, 2316, 2316, 2316, 2316, 2316, 2316, 2316, 2316, 2316, 2316, 2316, 2316, 2316, 2316, 2316, 2316, 2316, 2316, 2316, 2316, 2316, 2316, 2316, 2316, 2316, 2316, 2316, 2316, 2316, 2316, 2316, 2316, 2316, 2316, 2316, 2316, 2316, 2315, 2315, 2315, 2315, 2315, 2315, 2315, 2315, 2315, 2315, 2315, 2315, 2315, 2315, 2315, 2315, 2315, 2315, 2315, 2315, 2315, 2315, 2315, 2315, 2315, 2315, 2315, 2315, 2315, 2315, 2315, 2315, 2315, 2315, 2315, 2315, 2315, 2315, 2315, 2315, 2315, 2315, 2315, 2315, 2315, 2315, 2315, 2315, 2315, 2315, 2315, 2315, 2315, 2315, 2315, 2315, 2315, 2315, 2315, 2315, 2315, 2315, 2315, 2315, 2315, 2315, 2315, 2315, 2315, 2315, 2315, 2315, 2315, 2315, 2315, 2315, 2315, 2315, 2315, 2315, 2315, 2315, 2315, 2315, 2315, 2315, 2315, 2315, 2315, 2315, 2315, 2315, 2315, 2315, 2315, 2315, 2315, 2315, 2315, 2315, 2315, 2315, 2315, 2315, 2315, 2315, 2315, 2315, 2315]
 # 18 [2956, 2937, 2931, 2930, 2929, 2927, 2927, 2927, 2927, 2926, 2926, 2925, 2925, 2925, 2922, 2922, 2922, 2919, 2919, 2919, 2919, 2919, 2919, 2919, 2919, 2919, 2919, 2919, 2918, 2918, 2918, 2918, 2918, 2918, 2918, 2918, 2918, 2918, 2918, 2918, 2918, 2918, 2918, 2918, 2918, 2918, 2918, 2918, 2918, 2918, 2918, 2918, 2918, 2918, 2918, 2918, 2918, 2918, 2918, 2918, 2918, 2918, 2918, 2918, 2918, 2918, 2918, 2918, 2918, 2918, 2918, 2918, 2918, 2918, 2918, 2918, 2918, 2918, 2918, 2918, 2918, 2918, 2917, 2917, 2917, 2917, 2917, 2917, 2917, 2917, 2917, 2917, 2917, 2917, 2917, 2917, 2917, 2917, 2917, 2917, 2917, 2917, 2917, 2917, 2917, 2917, 2917, 2917, 2917, 2917, 2917, 2917, 2917, 2917, 2917, 2917, 2917, 2917, 2917, 2917, 2917, 2917, 2917, 2917, 2917, 2917, 2917, 2917, 2917, 2917, 2917, 2917, 2917, 2917, 2917, 2917, 2917, 2917, 2917, 2917, 2917, 2917, 2917, 2917, 2917, 2917, 2917, 2917, 2917, 2917, 2917, 2917, 2917, 2917, 2917, 2917, 2917, 2917, 2917, 2917, 2917, 2917, 2917, 2917, 2917, 2917, 2917, 2917, 2917, 2917, 2917, 2917, 2917, 2917, 2917, 2917, 2917, 2917, 2917, 2917, 2917, 2917, 2917, 2917, 2917, 2917, 2917, 2917, 2917, 2917, 2917, 2917, 2917, 2917, 2917, 2917, 2917, 2917, 2917, 2917]
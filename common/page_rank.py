@@ -1,49 +1,56 @@
 import numpy as np
+import scipy.sparse as sp
+
+from common.signed_graph import CompactDataset
 
 
 class PageRank:
+    """
+    PageRank of a signed network, the signs are ignored.
+    The transition matrix is a scipy.sparse matrix built from the CSR arrays of the dataset,
+    and the power iteration stops when the L1 change is below n * tol, the same as networkx.pagerank.
+    """
 
     def __init__(self, dataset):
-        import robustness.robustness_utils as utils
-        self.arr = utils.build_graph_from_numpy(dataset=dataset)
-        self.__ignore_signs()
+        """
+        class initialization
 
-    def __ignore_signs(self):
-        self.arr = np.abs(self.arr)
+        :param dataset: a dataset, a dict-based dataset is converted into a CompactDataset first
+        """
+        if not isinstance(dataset, CompactDataset):
+            dataset = CompactDataset.from_dataset(dataset)
+        self.n = dataset.node_count
+        # the signs are ignored, every edge has weight 1
+        self.arr = sp.csr_matrix((np.ones(len(dataset.indices)), dataset.indices, dataset.indptr),
+                                 shape=(self.n, self.n))
 
     def __trans_pre(self):
         """
-        构造转移矩阵
-        """
-        b = np.transpose(self.arr)  # 把矩阵转置
-        c = np.zeros(self.arr.shape, dtype=float)
-        for i in range(self.arr.shape[0]):
-            for j in range(self.arr.shape[1]):
-                c[i][j] = self.arr[i][j] / b[j].sum()  # 把所有的元素重新分配
-        return c
-
-    @staticmethod
-    def __init_pre(c):
+        the transition matrix, column j is the distribution of the next step from node j
         """
-        pr值的初始化
-        """
-        pr = np.zeros((c.shape[0], 1), dtype=float)
-        for i in range(c.shape[0]):
-            pr[i] = float(1) / c.shape[0]
-        return pr
+        out_degree = np.asarray(self.arr.sum(axis=1)).ravel()
+        inverse = np.zeros(self.n)
+        inverse[out_degree > 0] = 1.0 / out_degree[out_degree > 0]
+        return (self.arr.T @ sp.diags(inverse)).tocsr(), out_degree == 0
 
-    @staticmethod
-    def _page_rank(p, m, v):
+    def execute(self, p=0.85, tol=1.0e-6, max_iter=100):
         """
-        PageRank核心算法，p是网页跳转概率，m是转移矩阵，v是pr值
+        :param p: probability of following an edge, the damping factor
+        :param tol: the error tolerance of each node
+        :param max_iter: the maximum number of iterations
+        :return: an array of PageRank values over the nodes 0..n-1, summing to 1
         """
-        while not (v == p * np.dot(m, v) + (1 - p) * v).all():
-            v = p * np.dot(m, v) + (1 - p) * v
-            print((v == p * np.dot(m, v) + (1 - p) * v).all())
-        return v
-
-    def execute(self, p=0.85):
-        trans_matrix = self.__trans_pre()
-        pr = self.__init_pre(trans_matrix)
-        return self._page_rank(p, trans_matrix, pr)
 
+        if self.n == 0:
+            return np.zeros(0)
+        trans_matrix, dangling = self.__trans_pre()
+        v = np.full(self.n, 1.0 / self.n)
+        for _ in range(max_iter):
+            last = v
+            # the walk from a node without edges jumps to any node
+            v = p * (trans_matrix @ last + last[dangling].sum() / self.n) + (1 - p) / self.n
+            if np.abs(v - last).sum() < self.n * tol:
+                return v
+
+        print('PageRank does not converge in', max_iter, 'iterations')
+        return v
@@ -0,0 +1,312 @@
+# encoding: utf-8
+
+import collections
+import numpy as np
+from common.file_operations import Dataset, DynamicDataset
+
+
+class CompactDataset(Dataset):
+    """
+    array-backed data structure for a given dataset
+
+    vnum: num of vertices, int
+    enum: num of edges, int
+    indptr, indices, signs: the adjacency table in CSR form, each undirected edge is stored in both directions
+    mirror: the position of the reversed copy of each stored edge, so that signs can be changed in place
+    data: a dict-like view of the arrays, it can be used wherever Dataset.data is expected
+    """
+
+    def __init__(self, indptr, indices, signs, mirror=None, vnum=None, enum=None):
+        self.indptr = indptr
+        self.indices = indices
+        self.signs = signs
+        self.mirror = CompactDataset.__find_mirror(indptr, indices) if mirror is None else mirror
+        self.vnum = self.node_count if vnum is None else vnum
+        self.enum = int(np.count_nonzero(self.upper_slots())) if enum is None else enum
+        self.data = CompactAdjacency(self)
+
+    @staticmethod
+    def from_edges(src, dst, signs, vnum=None, enum=None):
+        """
+        build a compact dataset from an edge list, a repeated edge keeps the last sign like Dataset does
+
+        :param src: the first end of each edge, array-like
+        :param dst: the second end of each edge, array-like
+        :param signs: the sign of each edge, array-like of {1, -1}
+        :param vnum: number of vertices, default: the largest id plus one
+        :param enum: number of edges, default: number of distinct edges
+        :return: an instance of class CompactDataset
+        """
+
+        src = np.asarray(src, dtype=np.int64)
+        dst = np.asarray(dst, dtype=np.int64)
+        signs = np.asarray(signs, dtype=np.int8)
+        n = int(max(src.max(), dst.max())) + 1 if len(src) else 0
+        n = max(n, vnum or 0)
+
+        # store both directions, the order of lines decides which sign is kept
+        rows = np.concatenate([src, dst])
+        cols = np.concatenate([dst, src])
+        order = np.tile(np.arange(len(src)), 2)
+        keys = rows * n + cols
+        perm = np.lexsort((order, keys))
+        keys, slot_signs = keys[perm], np.concatenate([signs, signs])[perm]
+        last = np.ones(len(keys), dtype=bool)
+        last[:-1] = keys[1:] != keys[:-1]
+        keys, slot_signs = keys[last], slot_signs[last]
+
+        indptr, indices, mirror = CompactDataset._arrays_from_keys(keys, n)
+        return CompactDataset(indptr, indices, slot_signs, mirror=mirror, vnum=vnum, enum=enum)
+
+    @staticmethod
+    def from_dataset(dataset: Dataset):
+        """
+        convert a dict-based dataset into a compact dataset
+
+        :param dataset: an instance of class Dataset
+        :return: an instance of class CompactDataset
+        """
+
+        src, dst, signs = [], [], []
+        for node in dataset.data:
+            for nbr, attr in dataset.data[node].items():
+                if attr == 0:
+                    continue
+                src.append(node)
+                dst.append(nbr)
+                signs.append(attr)
+
+        return CompactDataset.from_edges(src, dst, signs, vnum=dataset.vnum, enum=dataset.enum)
+
+    def to_dataset(self):
+        """
+        convert into a dict-based dataset in the form of FileOperations.load_data(), the nodes without edges are left
+        out as when a file is parsed
+
+        :return: an instance of class Dataset
+        """
+
+        dataset = Dataset()
+        dataset.vnum, dataset.enum = self.vnum, self.enum
+        data = collections.defaultdict(lambda: collections.defaultdict(lambda: 0))
+        indptr, indices, signs = self.indptr.tolist(), self.indices.tolist(), self.signs.tolist()
+        for node in range(self.node_count):
+            start, end = indptr[node], indptr[node + 1]
+            if start < end:
+                data[node].update(zip(indices[start:end], signs[start:end]))
+        dataset.data = data
+        return dataset
+
+    @staticmethod
+    def _arrays_from_keys(keys, n):
+        """
+        construct indptr, indices and mirror from the sorted keys (row * n + col) of all stored edges
+        """
+
+        rows, cols = keys // max(n, 1), keys % max(n, 1)
+        indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=n), out=indptr[1:])
+        mirror = np.searchsorted(keys, cols * n + rows)
+        return indptr, cols.astype(np.int32), mirror
+
+    @staticmethod
+    def __find_mirror(indptr, indices):
+        n = len(indptr) - 1
+        rows = np.repeat(np.arange(n, dtype=np.int64), np.diff(indptr))
+        cols = indices.astype(np.int64)
+        return np.searchsorted(rows * n + cols, cols * n + rows)
+
+    @property
+    def node_count(self):
+        # number of rows in the arrays, may be larger than vnum when the header is wrong
+        return len(self.indptr) - 1
+
+    def degree(self, node=None):
+        """
+        :param node: number of node, default: all the nodes
+        :return: the degree of a node, or an array of degrees
+        """
+
+        if node is None:
+            return np.diff(self.indptr)
+        if not 0 <= node < self.node_count:
+            return 0
+        return int(self.indptr[node + 1] - self.indptr[node])
+
+    def neighbors(self, node):
+        """
+        :param node: number of node
+        :return: neighbors and signs of the edges, both are views of the arrays
+        """
+
+        if not 0 <= node < self.node_count:
+            return self.indices[:0], self.signs[:0]
+        start, end = self.indptr[node], self.indptr[node + 1]
+        return self.indices[start:end], self.signs[start:end]
+
+    def signed_neighbors(self, node):
+        """
+        :param node: number of node
+        :return: positive neighbors and negative neighbors, arrays
+        """
+
+        nbr, attr = self.neighbors(node)
+        return nbr[attr > 0], nbr[attr < 0]
+
+    def rows(self):
+        """
+        :return: the source node of each stored edge, the counterpart of self.indices
+        """
+
+        return np.repeat(np.arange(self.node_count, dtype=np.int32), np.diff(self.indptr))
+
+    def upper_slots(self):
+        """
+        :return: a mask over the stored edges that keeps every undirected edge once
+        """
+
+        return self.rows() <= self.indices
+
+    def edge_list(self):
+        """
+        every undirected edge once, the signs are read from the current arrays
+
+        :return: src, dst, signs
+        """
+
+        mask = self.upper_slots()
+        return self.rows()[mask], self.indices[mask], self.signs[mask]
+
+    def _position(self, v1, v2):
+        """
+        :return: the position of edge (v1, v2) in the arrays, -1 if it doesn't exist
+        """
+
+        if not 0 <= v1 < self.node_count:
+            return -1
+        start, end = self.indptr[v1], self.indptr[v1 + 1]
+        pos = start + int(np.searchsorted(self.indices[start:end], v2))
+        if pos < end and self.indices[pos] == v2:
+            return int(pos)
+        return -1
+
+    def to_dynamic(self, copy=False):
+        """
+        :param copy: give the dynamic dataset its own signs, the topology arrays are always shared
+        :return: an instance of class DynamicCompactDataset
+        """
+
+        # without a copy, signs changed by the dynamic dataset are seen here
+        signs = self.signs.copy() if copy else self.signs
+        dynamic_dataset = DynamicCompactDataset(self.indptr, self.indices, signs, mirror=self.mirror,
+                                                vnum=self.vnum, enum=self.enum)
+        return dynamic_dataset
+
+
+class DynamicCompactDataset(CompactDataset, DynamicDataset):
+    """
+    array-backed data structure for a given dataset about robustness, the signs are changed in place
+    """
+
+    def reverse_node(self, v):
+        if not 0 <= v < self.node_count:
+            return
+        start, end = self.indptr[v], self.indptr[v + 1]
+        self.signs[start:end] *= -1
+        # a self-loop is its own mirror and is reversed twice, the same as DynamicDataset
+        self.signs[self.mirror[start:end]] *= -1
+
+    def reverse_edge(self, v1, v2):
+        pos = self._position(v1, v2)
+        if pos < 0:
+            return
+        self.signs[pos] *= -1
+        self.signs[self.mirror[pos]] *= -1
+
+    def remove_node(self, v):
+        """
+        the topology is frozen in the arrays, so the arrays are rebuilt without the edges of v
+        """
+
+        if self.degree(v) == 0:
+            return
+        n = self.node_count
+        rows = self.rows().astype(np.int64)
+        keep = (rows != v) & (self.indices != v)
+        keys = rows[keep] * n + self.indices[keep]
+        self.signs = self.signs[keep]
+        self.indptr, self.indices, self.mirror = CompactDataset._arrays_from_keys(keys, n)
+        self.topology_version += 1
+
+
+class CompactAdjacency:
+    """
+    a dict-like view of a compact dataset, {node: CompactRow}
+    Only the nodes with edges are iterated, and an unknown node gets an empty row instead of a KeyError.
+    """
+
+    def __init__(self, graph: CompactDataset):
+        self._graph = graph
+
+    def __getitem__(self, node):
+        return CompactRow(self._graph, node)
+
+    def __contains__(self, node):
+        return self._graph.degree(node) > 0
+
+    def __iter__(self):
+        return iter(np.flatnonzero(self._graph.degree()).tolist())
+
+    def __len__(self):
+        return int(np.count_nonzero(self._graph.degree()))
+
+    def keys(self):
+        return list(self)
+
+    def values(self):
+        return [self[node] for node in self]
+
+    def items(self):
+        return [(node, self[node]) for node in self]
+
+
+class CompactRow:
+    """
+    a dict-like view of the neighbors of a node, {nbr: sign}
+    A missing neighbor is read as 0 and cannot be written, because the topology is frozen.
+    """
+
+    __slots__ = ('_graph', '_node')
+
+    def __init__(self, graph: CompactDataset, node):
+        self._graph = graph
+        self._node = node
+
+    def __len__(self):
+        return self._graph.degree(self._node)
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __contains__(self, nbr):
+        return self._graph._position(self._node, nbr) >= 0
+
+    def __getitem__(self, nbr):
+        pos = self._graph._position(self._node, nbr)
+        return 0 if pos < 0 else int(self._graph.signs[pos])
+
+    def __setitem__(self, nbr, value):
+        pos = self._graph._position(self._node, nbr)
+        if pos < 0:
+            raise KeyError('the edge ({0}, {1}) does not exist in a compact dataset'.format(self._node, nbr))
+        self._graph.signs[pos] = value
+
+    def keys(self):
+        return self._graph.neighbors(self._node)[0].tolist()
+
+    def values(self):
+        return self._graph.neighbors(self._node)[1].tolist()
+
+    def items(self):
+        nbr, attr = self._graph.neighbors(self._node)
+        return zip(nbr.tolist(), attr.tolist())
@@ -0,0 +1,47 @@
+import os
+import pickle
+
+
+"""
+Checkpoints of long attack runs, see NetworkAttack.attack_in_batches().
+A checkpoint is a pickled dict with the attacked nodes in order, the current solution as an int32 array,
+the curve so far, the position in the schedule, the state of the module random and the state of a warm-start solver.
+The dataset itself is not stored: it is loaded again and the attacked nodes are reversed without any solve.
+The run writing a checkpoint continues from it in the same way as a resumed run, see NetworkAttack.continue_from(),
+so a run killed and resumed gives the same results as the run not killed.
+"""
+
+CHECKPOINT_VERSION = 1
+
+
+def save_checkpoint(path: str, state: dict):
+    """
+    write a checkpoint atomically, the previous checkpoint is kept if the process dies while writing
+
+    :param path: file path
+    :param state: the state of an attack
+    :return: None
+    """
+
+    state = dict(state, version=CHECKPOINT_VERSION)
+    temp = path + '.tmp' + str(os.getpid())
+    with open(temp, 'wb') as f:
+        pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp, path)
+
+
+def load_checkpoint(path: str) -> dict:
+    """
+    :param path: file path
+    :return: the state of an attack, None if there is no checkpoint
+    """
+
+    if not os.path.exists(path):
+        return None
+    with open(path, 'rb') as f:
+        state = pickle.load(f)
+    if state.get('version') != CHECKPOINT_VERSION:
+        raise ValueError('unsupported checkpoint version: {0}'.format(state.get('version')))
+    return state
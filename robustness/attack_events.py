@@ -0,0 +1,173 @@
+import sys
+import json
+import time
+
+
+"""
+Events of the attack loops, see NetworkAttack.attack_in_batches().
+An attack sends each event to its sink only if sink.enabled(event), and the costly values of a payload are given
+as functions without arguments, which are called by the sinks that write them. So a NullSink costs one set lookup
+per event, and e.g. the max cluster size is only computed when some sink wants it.
+
+events:
+    attack_resumed: step
+    step_started: step, total
+    node_protected: step, node
+    node_attacked: step, node
+    frustration_solved: step, frustration
+    cluster_stats: step, clusters, max_cluster_size
+    attack_finished: robustness, seconds
+"""
+
+ATTACK_RESUMED = 'attack_resumed'
+STEP_STARTED = 'step_started'
+NODE_PROTECTED = 'node_protected'
+NODE_ATTACKED = 'node_attacked'
+FRUSTRATION_SOLVED = 'frustration_solved'
+CLUSTER_STATS = 'cluster_stats'
+ATTACK_FINISHED = 'attack_finished'
+
+EVENTS = (ATTACK_RESUMED, STEP_STARTED, NODE_PROTECTED, NODE_ATTACKED, FRUSTRATION_SOLVED, CLUSTER_STATS,
+          ATTACK_FINISHED)
+
+
+def resolve(payload: dict) -> dict:
+    """
+    :param payload: the payload of an event
+    :return: the payload with the lazy values computed
+    """
+    return {key: value() if callable(value) else value for key, value in payload.items()}
+
+
+class AttackSink:
+    """
+    The base class of the sinks of attack events.
+
+    events: the events handled by the sink, the others are never built
+    """
+
+    def __init__(self, events=EVENTS):
+        """
+        class initialization
+
+        :param events: the names of the events to handle
+        """
+        self.events = frozenset(events)
+
+    def enabled(self, event) -> bool:
+        return event in self.events
+
+    def emit(self, event, payload: dict):
+        pass
+
+    def flush(self):
+        """
+        write the buffered events, called by the attacks at checkpoints and at the end
+        """
+        pass
+
+    def close(self):
+        self.flush()
+
+
+class NullSink(AttackSink):
+    """
+    A sink dropping all the events.
+    """
+
+    def __init__(self):
+        super().__init__(events=())
+
+
+class ConsoleSink(AttackSink):
+    """
+    A sink printing the events in the same words as the attacks used to, the default sink.
+    """
+
+    MESSAGES = {
+        ATTACK_RESUMED: 'Attack is resumed from step {step}',
+        STEP_STARTED: 'Attack is processing: {step} / {total} ...',
+        NODE_PROTECTED: 'Current node {node} is protected!',
+        NODE_ATTACKED: 'Node {node} is attacked!',
+        FRUSTRATION_SOLVED: 'Current frustration index: {frustration}',
+        CLUSTER_STATS: 'Max cluster size: {max_cluster_size}'
+    }
+
+    def __init__(self, events=tuple(MESSAGES.keys()), stream=None):
+        """
+        class initialization
+
+        :param events: the names of the events to print
+        :param stream: a text stream, default: sys.stdout at the time of printing
+        """
+        super().__init__(events=events)
+        self.stream = stream
+
+    def emit(self, event, payload: dict):
+        print(ConsoleSink.MESSAGES[event].format(**resolve(payload)), file=self.stream or sys.stdout)
+
+
+class BufferedLogSink(AttackSink):
+    """
+    A sink writing one line per event into a log file, the lines are written in blocks of buffer_size.
+    """
+
+    def __init__(self, path, events=EVENTS, buffer_size=1000):
+        """
+        class initialization
+
+        :param path: file path of the log, appended to
+        :param events: the names of the events to write
+        :param buffer_size: number of lines kept in memory before they are written
+        """
+        super().__init__(events=events)
+        self.path = path
+        self.buffer_size = buffer_size
+        self.lines = []
+
+    def emit(self, event, payload: dict):
+        values = ' '.join('{0}={1}'.format(key, value) for key, value in resolve(payload).items())
+        self.lines.append('{0:.3f} {1} {2}\n'.format(time.time(), event, values))
+        if len(self.lines) >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        if self.lines:
+            with open(self.path, 'a') as f:
+                f.writelines(self.lines)
+            self.lines = []
+
+
+class JsonlSink(AttackSink):
+    """
+    A sink writing one JSON object per event, {"event": name, "time": seconds, ...payload}, into a file or a stream.
+    """
+
+    def __init__(self, target, events=EVENTS):
+        """
+        class initialization
+
+        :param target: file path, or an open text stream which is not closed by the sink
+        :param events: the names of the events to write
+        """
+        super().__init__(events=events)
+        if isinstance(target, str):
+            self.stream = open(target, 'a')
+            self.own_stream = True
+        else:
+            self.stream = target
+            self.own_stream = False
+
+    def emit(self, event, payload: dict):
+        record = {'event': event, 'time': time.time()}
+        record.update(resolve(payload))
+        self.stream.write(json.dumps(record, default=int) + '\n')
+
+    def flush(self):
+        self.stream.flush()
+
+    def close(self):
+        if self.own_stream:
+            self.stream.close()
+        else:
+            self.stream.flush()
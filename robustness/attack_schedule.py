@@ -0,0 +1,65 @@
+import math
+
+
+class AttackSchedule:
+    """
+    The number of nodes attacked between two solves of the frustration.
+    A batch of nodes is attacked before the partition is solved again, so an attack with n nodes needs far fewer
+    solves than n, and the frustration curve is recorded at the solve points only.
+        fixed: the same batch size every time, batch=1 is the attack node by node
+        geometric: the batch size is multiplied by a ratio after each solve, fine at the beginning and coarse later
+        percent: a solve after every x percent of the nodes of the network
+    """
+
+    FIXED = 'fixed'
+    GEOMETRIC = 'geometric'
+    PERCENT = 'percent'
+
+    def __init__(self, batch=1, mode=FIXED, ratio=2.0, percent=1.0):
+        """
+        class initialization, see AttackSchedule.fixed(), geometric() and every_percent()
+
+        :param batch: the (first) batch size
+        :param mode: enum {"fixed", "geometric", "percent"}
+        :param ratio: the growth of the batch size in the geometric mode
+        :param percent: percent of nodes between two solves in the percent mode
+        """
+        assert mode in {AttackSchedule.FIXED, AttackSchedule.GEOMETRIC, AttackSchedule.PERCENT}
+        assert batch >= 1 and ratio >= 1.0 and percent > 0
+        self.batch = batch
+        self.mode = mode
+        self.ratio = ratio
+        self.percent = percent
+
+    @staticmethod
+    def fixed(batch=1):
+        return AttackSchedule(batch=batch, mode=AttackSchedule.FIXED)
+
+    @staticmethod
+    def geometric(ratio=2.0, first=1):
+        return AttackSchedule(batch=first, mode=AttackSchedule.GEOMETRIC, ratio=ratio)
+
+    @staticmethod
+    def every_percent(percent=1.0):
+        return AttackSchedule(mode=AttackSchedule.PERCENT, percent=percent)
+
+    def batches(self, total, vnum=None):
+        """
+        :param total: number of attacks
+        :param vnum: number of nodes of the network, required by the percent mode
+        :return: a generator of batch sizes summing up to total
+        """
+
+        if self.mode == AttackSchedule.PERCENT:
+            assert vnum is not None, 'the percent mode needs the number of nodes'
+            size = max(1, math.ceil(vnum * self.percent / 100))
+        else:
+            size = self.batch
+
+        done = 0
+        while done < total:
+            current = min(int(size), total - done)
+            yield current
+            done += current
+            if self.mode == AttackSchedule.GEOMETRIC:
+                size = max(size * self.ratio, size + 1)
@@ -0,0 +1,175 @@
+import os
+import math
+import random as rd
+import numpy as np
+
+from concurrent.futures import ProcessPoolExecutor
+from common.file_operations import Dataset
+from common.signed_graph import CompactDataset
+
+
+"""
+Betweenness centrality on the CSR arrays of a CompactDataset, the signs are ignored.
+The sources are handled by Brandes' algorithm with a level-synchronous BFS, all the nodes of a level at once with numpy,
+and blocks of sources at once, so the numpy calls of a level are shared by the sources of a block.
+The exact result sums over all the sources, the sampled result over k pivots scaled by n / k,
+and the pivots are shared among the processes of a pool.
+The results are normalized in the same way as networkx.betweenness_centrality on an undirected graph.
+"""
+
+# the arrays of a worker process, see _init_worker()
+_shared_indptr = None
+_shared_indices = None
+
+
+def _init_worker(indptr, indices):
+    global _shared_indptr, _shared_indices
+    _shared_indptr, _shared_indices = indptr, indices
+
+
+# the number of (source, node) pairs and (source, edge) pairs searched at once, see block_dependency()
+BLOCK_SIZE = 1 << 22
+
+
+def _expand(indptr, nodes, keys):
+    """
+    :param nodes: the nodes of the frontier
+    :param keys: the keys of the frontier, one per node
+    :return: the positions of the edges of the frontier nodes in the CSR arrays, and the key of the head of each edge
+    """
+
+    starts = indptr[nodes]
+    counts = indptr[nodes + 1] - starts
+    total = int(counts.sum())
+    offsets = np.repeat(starts - (np.cumsum(counts) - counts), counts)
+    return np.arange(total) + offsets, np.repeat(keys, counts)
+
+
+def block_dependency(indptr, indices, sources):
+    """
+    the dependencies of all the nodes on a block of sources by Brandes' algorithm,
+    the BFS of all the sources advance together, so each level costs a few numpy calls for the whole block
+    and a source costs O(m) even when the graph is deep, e.g. a long cycle.
+    The pair (b, v) of the b-th source and the node v is kept at the key b * n + v.
+
+    :param indptr: CSR index pointers
+    :param indices: CSR neighbors
+    :param sources: the source nodes
+    :return: an array of the dependencies summed over the sources, 0 for a node on itself
+    """
+
+    n = len(indptr) - 1
+    sources = np.asarray(sources, dtype=np.int64)
+    size = len(sources) * n
+    dist = np.full(size, -1, dtype=np.int32)
+    sigma = np.zeros(size, dtype=np.float64)
+    frontier = np.arange(len(sources), dtype=np.int64) * n + sources
+    dist[frontier], sigma[frontier] = 0, 1.0
+
+    # the edges (u, w) of each level with dist[w] == dist[u] + 1, as keys
+    levels = []
+    depth = 0
+    while len(frontier):
+        base = frontier - frontier % n
+        pos, u = _expand(indptr, frontier - base, frontier)
+        w = indices[pos].astype(np.int64) + (u - u % n)
+        new = w[dist[w] < 0]
+        dist[new] = depth + 1
+        forward = dist[w] == depth + 1
+        u, w = u[forward], w[forward]
+        # the sums are over the pairs of the level only
+        frontier, inverse = np.unique(w, return_inverse=True)
+        sigma[frontier] += np.bincount(inverse, weights=sigma[u], minlength=len(frontier))
+        levels.append((u, w))
+        depth += 1
+
+    delta = np.zeros(size, dtype=np.float64)
+    for u, w in reversed(levels):
+        heads, inverse = np.unique(u, return_inverse=True)
+        delta[heads] += np.bincount(inverse, weights=sigma[u] / sigma[w] * (1.0 + delta[w]), minlength=len(heads))
+    delta[np.arange(len(sources)) * n + sources] = 0.0
+    return delta.reshape(len(sources), n).sum(axis=0)
+
+
+def single_source_dependency(indptr, indices, s):
+    """
+    the dependencies of all the nodes on a source, see block_dependency()
+
+    :param s: the source node
+    :return: an array of dependencies, 0 for the source
+    """
+
+    return block_dependency(indptr, indices, [s])
+
+
+def _accumulate(sources):
+    indptr, indices = _shared_indptr, _shared_indices
+    bc = np.zeros(len(indptr) - 1, dtype=np.float64)
+    # the arrays of a block have about BLOCK_SIZE items
+    block = max(1, BLOCK_SIZE // (len(indptr) + len(indices)))
+    for i in range(0, len(sources), block):
+        bc += block_dependency(indptr, indices, sources[i:i + block])
+    return bc
+
+
+def pivot_number(n, epsilon):
+    """
+    number of pivots for an additive error about epsilon with high probability, log(n) / epsilon^2 (Eppstein and Wang)
+
+    :param n: number of nodes
+    :param epsilon: the error of normalized betweenness
+    :return: number of pivots, at most n
+    """
+
+    return min(n, max(1, math.ceil(math.log(max(n, 2)) / epsilon ** 2)))
+
+
+def betweenness_centrality(dataset: Dataset, k=None, epsilon=None, seed=None, workers=1, normalized=True) -> dict:
+    """
+    betweenness centrality of an undirected graph, exact by default
+
+    :param dataset: a dataset, a dict-based dataset is converted into a CompactDataset first
+    :param k: number of pivots of the sampled mode
+    :param epsilon: the error of the sampled mode, see pivot_number(), ignored if k is given
+    :param seed: random seed of the pivots
+    :param workers: number of processes, default: 1, None for all the cores
+    :param normalized: normalized by 1 / ((n - 1)(n - 2)) as networkx, otherwise halved for the undirected graph
+    :return: {node: betweenness} of the nodes with edges
+    """
+
+    if not isinstance(dataset, CompactDataset):
+        dataset = CompactDataset.from_dataset(dataset)
+    indptr = np.asarray(dataset.indptr, dtype=np.int64)
+    indices = np.asarray(dataset.indices)
+    nodes = np.flatnonzero(np.diff(indptr)).tolist()
+    n = len(nodes)
+
+    if k is None and epsilon is not None:
+        k = pivot_number(n, epsilon)
+    if k is None or k >= n:
+        k, sources = None, nodes
+    else:
+        # follow random.seed() like the rest of the attacks
+        sources = rd.Random(rd.getrandbits(64) if seed is None else seed).sample(nodes, k)
+
+    workers = min(workers or os.cpu_count(), max(len(sources), 1))
+    if workers > 1:
+        chunks = [sources[i::workers] for i in range(workers)]
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(indptr, indices)) as executor:
+            bc = sum(executor.map(_accumulate, chunks))
+    else:
+        _init_worker(indptr, indices)
+        bc = _accumulate(sources)
+
+    # the same rescaling as networkx
+    if normalized:
+        scale = 1 / ((n - 1) * (n - 2)) if n > 2 else None
+    else:
+        scale = 0.5
+    if scale is not None:
+        if k is not None:
+            scale = scale * n / k
+        bc = bc * scale
+
+    return dict(zip(nodes, bc[nodes].tolist()))
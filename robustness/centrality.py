@@ -1,7 +1,8 @@
 import os.path
 import random as rd
-import networkx as nx
-import robustness.robustness_utils as utils
+import balance.balance_utils as balance_utils
+from robustness.betweenness import betweenness_centrality
+from common.page_rank import PageRank
 
 from common.file_operations import FileOperations
 
@@ -13,23 +14,51 @@ class Centrality:
     BETWEENNESS = 3
     DEGREE = 4
     R_DEGREE = 5
+    PAGE_RANK = 6
 
-    def __init__(self, centrality):
+    # the centralities that ignore the signs, they are unchanged when only signs are reversed
+    TOPOLOGICAL = {BETWEENNESS, PAGE_RANK}
+
+    def __init__(self, centrality, pivots=None, epsilon=None, seed=None, workers=1):
+        """
+        class initialization
+
+        :param centrality: one of the centralities above
+        :param pivots: optional, number of pivots of sampled betweenness
+        :param epsilon: optional, the error of sampled betweenness, see betweenness.pivot_number()
+        :param seed: random seed of the pivots
+        :param workers: number of processes of betweenness
+        """
         self._centrality = centrality
+        self.betweenness_options = {'k': pivots, 'epsilon': epsilon, 'seed': seed, 'workers': workers}
+        # (dataset, topology version, centralities) of the last topological centrality
+        self._cache = None
         assert centrality in {Centrality.RANDOM, Centrality.NODE_FRUSTRATION, Centrality.BETWEENNESS, Centrality.DEGREE,
-                              Centrality.R_DEGREE}
+                              Centrality.R_DEGREE, Centrality.PAGE_RANK}
 
     def get_centrality_of_nodes(self, param) -> dict:
 
+        if self._centrality in Centrality.TOPOLOGICAL:
+            # param is the dataset, it is computed again only after the topology is changed
+            if self._cache is not None and self._cache[0] is param and self._cache[1] == param.topology_version:
+                return self._cache[2]
+            cents = self.__get_centrality_of_nodes(param)
+            self._cache = (param, param.topology_version, cents)
+            return cents
+
+        return self.__get_centrality_of_nodes(param)
+
+    def __get_centrality_of_nodes(self, param) -> dict:
+
         if self._centrality == Centrality.RANDOM:
             return self._get_centrality_by_random(param.vnum)
 
         elif self._centrality == Centrality.NODE_FRUSTRATION:
             partition, nbr = param['partition'], param['neighbor_structure']
-            return self._get_centrality_by_frustration(partition, nbr)
+            return self._get_centrality_by_frustration(partition, nbr, param.get('objective_function'))
 
         elif self._centrality == Centrality.BETWEENNESS:
-            return self._get_centrality_by_betweenness(param)
+            return self._get_centrality_by_betweenness(param, **self.betweenness_options)
 
         elif self._centrality == Centrality.DEGREE:
             _, nbr = param['partition'], param['neighbor_structure']
@@ -38,6 +67,9 @@ class Centrality:
             _, nbr = param['partition'], param['neighbor_structure']
             return self._get_centrality_by_r_degree(nbr)
 
+        elif self._centrality == Centrality.PAGE_RANK:
+            return self._get_centrality_by_page_rank(param)
+
     def get_node_with_best_centrality(self, param, candidate):
 
         cents = self.get_centrality_of_nodes(param)
@@ -58,6 +90,9 @@ class Centrality:
         elif self._centrality == Centrality.R_DEGREE:
             return max(cents, key=cents.get)
 
+        elif self._centrality == Centrality.PAGE_RANK:
+            return max(cents, key=cents.get)
+
     @staticmethod
     def _get_centrality_by_random(n):
         return {i: rd.random() for i in range(n)}
@@ -71,26 +106,24 @@ class Centrality:
     #
 
     @staticmethod
-    def _get_centrality_by_frustration(partition, neighbor_structure):
+    def _get_centrality_by_frustration(partition, neighbor_structure, objective_function=None):
 
-        frustrations = {}
+        if objective_function is not None:
+            # the scores are maintained by the objective function, see Frustration.node_frustrations()
+            return objective_function.node_frustrations(neighbor_structure, default=-1)
+        return balance_utils.node_frustrations(partition, neighbor_structure, default=-1)
 
-        for cid, community in partition.items():
-            for single_node in community:
-                if single_node not in neighbor_structure:
-                    frustrations[single_node] = -1
-                    continue
-                node_nbr = neighbor_structure[single_node]
-                frustrations[single_node] = len(node_nbr['+'] - community) + len(community & node_nbr['-'])
+    @staticmethod
+    def _get_centrality_by_betweenness(dataset, k=None, epsilon=None, seed=None, workers=1):
 
-        return frustrations
+        # BFS on the CSR arrays, exact unless pivots or an error are given
+        return betweenness_centrality(dataset, k=k, epsilon=epsilon, seed=seed, workers=workers)
 
     @staticmethod
-    def _get_centrality_by_betweenness(dataset):
+    def _get_centrality_by_page_rank(dataset):
 
-        graph = utils.build_graph_from_networkx(dataset)
-        bcs = nx.centrality.betweenness_centrality(graph)
-        return bcs
+        prs = PageRank(dataset).execute()
+        return dict(enumerate(prs.tolist()))
 
     @staticmethod
     def _get_centrality_by_degree(neighbor_structure):
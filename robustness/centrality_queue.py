@@ -0,0 +1,106 @@
+import heapq
+
+from robustness.centrality import Centrality
+from common.file_operations import DynamicDataset
+
+
+class CentralityQueue:
+    """
+    A lazy max-heap of the degree centralities of a dynamic dataset.
+    The scores are the same as Centrality.DEGREE and Centrality.R_DEGREE read from the neighborhood structure of IG:
+        DEGREE: number of positive edges
+        R_DEGREE: number of positive edges minus number of negative edges to nodes with positive edges,
+                  0 for a node without positive edges
+    After the signs around a node are reversed, only the scores of the nodes nearby are updated and pushed again,
+    and the outdated entries are dropped when they reach the top. Ties are broken by the smaller node.
+    """
+
+    def __init__(self, dataset: DynamicDataset, centrality):
+        """
+        class initialization
+
+        :param dataset: a dynamic dataset
+        :param centrality: Centrality.DEGREE or Centrality.R_DEGREE
+        """
+
+        assert centrality in {Centrality.DEGREE, Centrality.R_DEGREE}
+        self.dataset = dataset
+        self.centrality = centrality
+        self.positive = {x: self.__count_positive(x) for x in dataset.data.keys()}
+        self.score = {x: self.__score(x) for x in self.positive}
+        self.heap = [(-score, x) for x, score in self.score.items()]
+        heapq.heapify(self.heap)
+
+    def __count_positive(self, x):
+        return sum(1 for attr in self.dataset.data[x].values() if attr > 0)
+
+    def __score(self, x):
+        pos = self.positive.get(x, 0)
+        if self.centrality == Centrality.DEGREE or pos == 0:
+            return pos
+        data = self.dataset.data
+        neg = sum(1 for y, attr in data[x].items() if attr < 0 and self.positive.get(y, 0) > 0)
+        return pos - neg
+
+    def update(self, v):
+        """
+        update the scores after the signs of the edges around v are reversed
+
+        :param v: number of node
+        :return: None
+        """
+
+        data = self.dataset.data
+        nodes = set(data[v].keys())
+        nodes.add(v)
+        affected = set(nodes)
+        for x in nodes:
+            pos = self.__count_positive(x)
+            if (pos > 0) != (self.positive.get(x, 0) > 0) and self.centrality == Centrality.R_DEGREE:
+                # x appears in or disappears from the negative neighbors of its neighbors
+                affected.update(data[x].keys())
+            self.positive[x] = pos
+
+        for x in affected:
+            self.push(x)
+
+    def push(self, x):
+        """
+        recalculate the score of x and put it into the queue
+
+        :param x: number of node
+        :return: None
+        """
+
+        self.score[x] = self.__score(x)
+        heapq.heappush(self.heap, (-self.score[x], x))
+
+    def peek(self, candidate, prune=False):
+        """
+        get the node with the largest score among the candidates without removing it
+
+        :param candidate: a set of nodes
+        :param prune: drop the entries of the nodes out of the candidates, when they are never candidates again
+                      until they are pushed again
+        :return: number of node, None if no candidate is in the queue
+        """
+
+        heap = self.heap
+        aside = []
+        target = None
+        while heap:
+            neg_score, x = heap[0]
+            if self.score.get(x) != -neg_score:
+                heapq.heappop(heap)
+                continue
+            if x not in candidate:
+                entry = heapq.heappop(heap)
+                if not prune:
+                    aside.append(entry)
+                continue
+            target = x
+            break
+
+        for entry in aside:
+            heapq.heappush(heap, entry)
+        return target
@@ -3,6 +3,7 @@ from abc import ABC
 from common.file_operations import FileOperations
 from robustness.network_attack import NetworkAttack
 from robustness.centrality import Centrality
+from robustness.centrality_queue import CentralityQueue
 
 import numpy as np
 import common.file_operations as fo
@@ -19,43 +20,37 @@ class DynamicAttack(NetworkAttack, ABC):
         if not candidate:
             candidate = self.node_available
 
+        if self.centrality == Centrality.DEGREE or self.centrality == Centrality.R_DEGREE:
+            if self.centrality_queue is None:
+                self.centrality_queue = CentralityQueue(self.dataset, self.centrality)
+            # an attacked node leaves node_available for good unless it is restored, and then it is pushed again
+            target = self.centrality_queue.peek(candidate, prune=candidate is self.node_available)
+            if target is not None:
+                return target
+
         if self.centrality == Centrality.NODE_FRUSTRATION or self.centrality == Centrality.DEGREE\
                 or self.centrality == Centrality.R_DEGREE:
             param = {'partition': alg.objective_function.partition,
-                     'neighbor_structure': alg.neighborhood.neighborhood_structure}
+                     'neighbor_structure': alg.neighborhood.neighborhood_structure,
+                     'objective_function': alg.objective_function}
         else:
             param = self.dataset
         return self.pick_helper.get_node_with_best_centrality(param, candidate)
 
-    def execute(self, k=1.0):
+    def execute(self, k=1.0, schedule=None, checkpoint=None, checkpoint_every=1, resume=False, step_time=None):
+        """
+        :param k: ratio of attacked nodes
+        :param schedule: an instance of AttackSchedule, default: solve after every node
+        :param checkpoint: optional, file path of the checkpoint written during the attack
+        :param checkpoint_every: number of batches between two checkpoints
+        :param resume: continue from the checkpoint if it exists
+        :param step_time: optional, the time slice in seconds of each solve
+        :return: robustness value
+        """
 
         num_of_attack = int(k * self.dataset.vnum)
-        alg = self.algorithm_to_get_frustration(self.dataset)
-        robustness_value = 0
-        m = self.dataset.enum
-
-        for i in range(num_of_attack):
-
-            if not self.node_available:
-                break
-
-            print("Attack is processing: {0} / {1} ...".format(i, num_of_attack))
-            current_node = self.pick_next(alg=alg)
-            self.attack_node(current_node)
-            alg = self.algorithm_to_get_frustration(self.dataset, max_iter=200)
-            current_robustness = alg.objective_function.obj_value
-            robustness_value += (m - current_robustness)
-
-            self.process.append(current_robustness)
-            self.node_attack_sequence.append(current_node)
-
-            print("Node", current_node, "is attacked!")
-            print("Current frustration index:", alg.objective_function.obj_value)
-            print("Max cluster size:", max([len(c) for c in alg.objective_function.partition.values()]))
-
-        robustness_value = robustness_value / num_of_attack / m
-
-        return robustness_value
+        return self.attack_in_batches(num_of_attack, schedule=schedule, checkpoint=checkpoint,
+                                      checkpoint_every=checkpoint_every, resume=resume, step_time=step_time)
 
 
 if __name__ == "__main__":
@@ -1,14 +1,44 @@
-from dynamic_attack import DynamicAttack
+from robustness.dynamic_attack import DynamicAttack
+from robustness.network_attack import NetworkAttack
 
 from common.file_operations import FileOperations
+from common.signed_graph import CompactDataset
 from robustness.centrality import Centrality
+from concurrent.futures import ProcessPoolExecutor
 
+import os
 import numpy as np
+import random as rd
 import common.file_operations as fo
 
 
+# the read-only dataset of a worker process, see get_protected_nodes_by_frustration()
+_shared_graph = None
+_max_iter = 150
+_seed = None
+
+
+def _init_worker(graph, max_iter, seed):
+    global _shared_graph, _max_iter, _seed
+    _shared_graph, _max_iter, _seed = graph, max_iter, seed
+
+
+def _frustration_after_attack(v):
+    """
+    solve the shared dataset with the signs around v reversed, the shared signs are not changed
+    """
+    if _seed is not None:
+        rd.seed(_seed + v)
+    dataset = _shared_graph.to_dynamic(copy=True)
+    dataset.reverse_node(v)
+    alg = NetworkAttack.algorithm_to_get_frustration(dataset, max_iter=_max_iter)
+    return alg.objective_function.obj_value
+
+
 class DynamicAttackWithProtection(DynamicAttack):
 
+    PROTECTIONS = ('centrality', 'frustration', 'random')
+
     def get_protected_nodes(self, p=0.2) -> set:
 
         protected_nodes = set()
@@ -23,21 +53,42 @@ class DynamicAttackWithProtection(DynamicAttack):
 
         return protected_nodes
 
-    def get_protected_nodes_by_frustration(self, p=0.2):
+    def get_protected_nodes_by_frustration(self, p=0.2, workers=None, max_iter=150, seed=None):
+        """
+        protect the nodes whose attack increases the frustration most
 
-        alg = self.algorithm_to_get_frustration(self.dataset)
+        :param p: ratio of protected nodes
+        :param workers: number of processes, default: all the cores
+        :param max_iter: number of IG iterations of each solve
+        :param seed: optional, the random seed of the solve of node v is seed + v
+        :return: a set of protected nodes
+        """
+
+        alg = self.algorithm_to_get_frustration(self.dataset, max_iter=max_iter)
         initial_frustration = alg.objective_function.obj_value
-        all_nodes = self.node_available.copy()
-        delta_f = dict()
-
-        for v in all_nodes:
-            self.attack_node(v)
-            alg = self.algorithm_to_get_frustration(self.dataset)
-            current_frustration = alg.objective_function.obj_value
-            delta_f[v] = current_frustration - initial_frustration
-            # 攻击后再撤销攻击
-            self.dataset.reverse_node(v)
-            self.node_available.add(v)
+        all_nodes = list(self.node_available)
+        workers = workers or os.cpu_count()
+
+        # each candidate is solved on its own copy of the signs, the dataset of the attack is never changed
+        if isinstance(self.dataset, CompactDataset):
+            graph = self.dataset
+        else:
+            graph = CompactDataset.from_dataset(self.dataset)
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(graph, max_iter, seed)) as executor:
+                frustrations = list(executor.map(_frustration_after_attack, all_nodes,
+                                                 chunksize=max(1, len(all_nodes) // (4 * workers))))
+        else:
+            # the solves reseed the module random, the state of the attack is kept as if they ran in other processes
+            state = rd.getstate()
+            try:
+                _init_worker(graph, max_iter, seed)
+                frustrations = [_frustration_after_attack(v) for v in all_nodes]
+            finally:
+                rd.setstate(state)
+
+        delta_f = {v: f - initial_frustration for v, f in zip(all_nodes, frustrations)}
 
         sorted_f = sorted(delta_f.items(), key=lambda x: x[1], reverse=True)
         num_of_protected_nodes = int(self.dataset.vnum * p)
@@ -48,50 +99,48 @@ class DynamicAttackWithProtection(DynamicAttack):
 
         all_nodes = list(self.node_available.copy())
         num_of_protected_nodes = int(self.dataset.vnum * p)
-        import random as rd
         rd.shuffle(all_nodes)
         return set(all_nodes[:num_of_protected_nodes])
 
-    def execute(self, k=1.0):
+    def get_protected_nodes_by(self, protection='centrality', p=0.1, workers=None):
+        """
+        :param protection: enum {"centrality", "frustration", "random"}
+        :param p: ratio of protected nodes
+        :param workers: number of processes of the frustration protection
+        :return: a set of protected nodes
+        """
+
+        assert protection in DynamicAttackWithProtection.PROTECTIONS
+        if protection == 'centrality':
+            return self.get_protected_nodes(p=p)
+        elif protection == 'frustration':
+            return self.get_protected_nodes_by_frustration(p=p, workers=workers)
+        else:
+            return self.get_protected_nodes_randomly(p=p)
+
+    def execute(self, k=1.0, schedule=None, checkpoint=None, checkpoint_every=1, resume=False, step_time=None,
+                protection='centrality', p=0.1, workers=None):
+        """
+        :param k: ratio of attacked nodes
+        :param schedule: an instance of AttackSchedule, default: solve after every node
+        :param checkpoint: optional, file path of the checkpoint written during the attack
+        :param checkpoint_every: number of batches between two checkpoints
+        :param resume: continue from the checkpoint if it exists
+        :param step_time: optional, the time slice in seconds of each solve
+        :param protection: the strategy of protection, see get_protected_nodes_by()
+        :param p: ratio of protected nodes
+        :param workers: number of processes of the frustration protection
+        :return: robustness value
+        """
 
         num_of_attack = int(k * self.dataset.vnum)
-        alg = self.algorithm_to_get_frustration(self.dataset)
-        robustness_value = 0
-        m = self.dataset.enum
-
-        pns = self.get_protected_nodes(p=0.1)
-        # pns = self.get_protected_nodes_by_frustration(p=0.2)
-        # pns = self.get_protected_nodes_randomly()
-        for i in range(num_of_attack):
-
-            if not self.node_available:
-                break
-
-            print("Attack is processing: {0} / {1} ...".format(i, num_of_attack))
-            current_node = self.pick_next(alg=alg)
-
-            if current_node in pns:
-                print("Current node", current_node, "is protected!")
-                self.process.append(alg.objective_function.obj_value)
-                self.node_attack_sequence.append(current_node)
-                self.node_available.remove(current_node)
-                continue
-
-            self.attack_node(current_node)
-            alg = self.algorithm_to_get_frustration(self.dataset, max_iter=200)
-            current_robustness = alg.objective_function.obj_value
-            robustness_value += (m - current_robustness)
-
-            self.process.append(current_robustness)
-            self.node_attack_sequence.append(current_node)
-
-            print("Node", current_node, "is attacked!")
-            print("Current frustration index:", alg.objective_function.obj_value)
-            print("Max cluster size:", max([len(c) for c in alg.objective_function.partition.values()]))
-
-        robustness_value = robustness_value / num_of_attack / m
 
-        return robustness_value
+        # the protected nodes of a resumed attack are read from the checkpoint
+        pns = None
+        if not self.can_resume(checkpoint, resume):
+            pns = self.get_protected_nodes_by(protection, p=p, workers=workers)
+        return self.attack_in_batches(num_of_attack, schedule=schedule, protected=pns, checkpoint=checkpoint,
+                                      checkpoint_every=checkpoint_every, resume=resume, step_time=step_time)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,274 @@
+import io
+import os
+import sys
+import json
+import time
+import sqlite3
+import argparse
+import itertools
+import contextlib
+import traceback
+import numpy as np
+import random as rd
+import multiprocessing as mp
+
+from algorithm.attack_session import AttackSession
+from robustness.network_attack import NetworkAttack
+from robustness.attack_schedule import AttackSchedule
+from robustness.attack_events import NullSink
+
+
+"""
+A runner of robustness experiments over a grid of dataset x centrality x protection x seed.
+Each cell is an attack run in its own worker process (a pool with maxtasksperchild=1), so the memory limit of a cell
+is set by RLIMIT_AS and is released with the process. The results are written by the parent process into one
+sqlite store, and the cells already in the store are skipped, so an interrupted grid is continued by running it again.
+A cell is identified by its dataset, centrality, protection and seed together with the options in KEY_OPTIONS, so a
+grid run again with other options adds its rows next to the old ones.
+
+usage:
+    python -m robustness.experiment_grid --datasets datasets/H/H97.g datasets/H/H98.g \\
+        --centralities degree r_degree --protections none random --seeds 0 1 2 --workers 8 --memory 4096
+"""
+
+NO_PROTECTION = 'none'
+CENTRALITY_ID = {name: cid for cid, name in NetworkAttack.ATTACK_CENTRALITY.items()}
+
+# the options changing the result of a cell, part of the key of the cell with their types in the store
+KEY_OPTIONS = (('k', float), ('p', float), ('batch', int), ('warm_start', int), ('compact', int), ('hops', int),
+               ('refine_iter', int), ('restart_iter', int))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    dataset TEXT NOT NULL,
+    centrality TEXT NOT NULL,
+    protection TEXT NOT NULL,
+    seed INTEGER NOT NULL,
+    k REAL NOT NULL,
+    p REAL NOT NULL,
+    batch INTEGER NOT NULL,
+    warm_start INTEGER NOT NULL,
+    compact INTEGER NOT NULL,
+    hops INTEGER NOT NULL,
+    refine_iter INTEGER NOT NULL,
+    restart_iter INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    robustness REAL,
+    process TEXT,
+    solve_points TEXT,
+    attack_sequence TEXT,
+    seconds REAL,
+    error TEXT,
+    finished REAL,
+    PRIMARY KEY (dataset, centrality, protection, seed, k, p, batch, warm_start, compact, hops, refine_iter,
+        restart_iter)
+)
+"""
+
+KEY_COLUMNS = ['dataset', 'centrality', 'protection', 'seed'] + [name for name, _ in KEY_OPTIONS]
+RESULT_COLUMNS = KEY_COLUMNS + ['status', 'robustness', 'process', 'solve_points', 'attack_sequence', 'seconds',
+                                'error', 'finished']
+
+
+class ExperimentGrid:
+    """
+    The class of an experiment grid.
+
+    cells: the product of datasets, centralities, protections and seeds
+    options: the settings shared by all the cells, see run_cell()
+    """
+
+    def __init__(self, datasets, centralities, protections=(NO_PROTECTION,), seeds=(0,), k=1.0, p=0.1,
+                 batch=1, warm_start=False, compact=True, hops=1, refine_iter=AttackSession.REFINE_ITER,
+                 restart_iter=AttackSession.RESTART_ITER):
+        """
+        class initialization
+
+        :param datasets: file paths of the datasets
+        :param centralities: names of centralities, see NetworkAttack.ATTACK_CENTRALITY
+        :param protections: "none" or the strategies of DynamicAttackWithProtection
+        :param seeds: random seeds
+        :param k: ratio of attacked nodes
+        :param p: ratio of protected nodes
+        :param batch: number of nodes attacked between two solves, see AttackSchedule
+        :param warm_start: see NetworkAttack
+        :param compact: load the datasets as CompactDataset
+        :param hops: see NetworkAttack, only for warm_start
+        :param refine_iter: see NetworkAttack, only for warm_start
+        :param restart_iter: see NetworkAttack, only for warm_start
+        """
+        from robustness.dynamic_attack_with_protection import DynamicAttackWithProtection
+
+        for name in centralities:
+            assert name in CENTRALITY_ID, 'unknown centrality: ' + name
+        for name in protections:
+            assert name == NO_PROTECTION or name in DynamicAttackWithProtection.PROTECTIONS, \
+                'unknown protection: ' + name
+
+        self.cells = list(itertools.product(datasets, centralities, protections, seeds))
+        self.options = {'k': k, 'p': p, 'batch': batch, 'warm_start': warm_start, 'compact': compact, 'hops': hops,
+                        'refine_iter': refine_iter, 'restart_iter': restart_iter}
+
+    def run(self, store, workers=None, memory=None):
+        """
+        run the cells not in the store yet
+
+        :param store: file path of the sqlite store
+        :param workers: number of processes, default: all the cores
+        :param memory: optional, the memory limit of each cell in MB
+        :return: number of cells run
+        """
+
+        connection = open_store(store)
+        done = finished_cells(connection)
+        tasks = [(cell, self.options, memory) for cell in self.cells
+                 if cell_key(cell, self.options) not in done]
+        print('{0} cells, {1} to run'.format(len(self.cells), len(tasks)))
+
+        workers = max(1, min(workers or os.cpu_count(), len(tasks)))
+        count = 0
+        if tasks:
+            # a fresh process for each cell, so the memory limit and the memory used are not carried over
+            with mp.get_context('spawn').Pool(processes=workers, maxtasksperchild=1) as pool:
+                for row in pool.imap_unordered(run_cell, tasks):
+                    write_result(connection, row)
+                    count += 1
+                    print('[{0}/{1}] {2} {3} {4} seed={5}: {6}'.format(
+                        count, len(tasks), row['dataset'], row['centrality'], row['protection'], row['seed'],
+                        row['status'] if row['status'] != 'done' else row['robustness']))
+        connection.close()
+        return count
+
+
+def option_values(options) -> dict:
+    """
+    :param options: see ExperimentGrid.options
+    :return: the options of KEY_OPTIONS with the types of the store
+    """
+    return {name: cast(options[name]) for name, cast in KEY_OPTIONS}
+
+
+def cell_key(cell, options):
+    return tuple(cell) + tuple(option_values(options).values())
+
+
+def open_store(store):
+    """
+    :param store: file path of the sqlite store
+    :return: a connection to the store, created if it does not exist
+    :raise ValueError: the store was written with another schema, its cells cannot be told apart
+    """
+    directory = os.path.dirname(os.path.abspath(store))
+    os.makedirs(directory, exist_ok=True)
+    connection = sqlite3.connect(store)
+    connection.execute(SCHEMA)
+    connection.commit()
+    columns = [row[1] for row in connection.execute('PRAGMA table_info(results)')]
+    if columns != RESULT_COLUMNS:
+        connection.close()
+        raise ValueError('the store {0} has the columns {1} instead of {2}, use another store'.format(
+            store, columns, RESULT_COLUMNS))
+    return connection
+
+
+def finished_cells(connection) -> set:
+    """
+    :return: the keys of the cells that are done, the failed cells are run again
+    """
+    rows = connection.execute("SELECT {0} FROM results WHERE status = 'done'".format(', '.join(KEY_COLUMNS)))
+    return {tuple(row) for row in rows}
+
+
+def write_result(connection, row):
+    connection.execute('INSERT OR REPLACE INTO results VALUES ({0})'.format(
+        ', '.join(':' + column for column in RESULT_COLUMNS)), row)
+    connection.commit()
+
+
+def _limit_memory(memory):
+    if memory is None:
+        return
+    import resource
+    limit = int(memory) * 1024 * 1024
+    resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+
+def run_cell(task) -> dict:
+    """
+    run one cell in a worker process
+
+    :param task: (dataset, centrality, protection, seed), options, memory limit in MB
+    :return: a row of the store
+    """
+    from common.file_operations import FileOperations
+    from robustness.dynamic_attack import DynamicAttack
+    from robustness.dynamic_attack_with_protection import DynamicAttackWithProtection
+
+    (dataset, centrality, protection, seed), options, memory = task
+    row = {'dataset': dataset, 'centrality': centrality, 'protection': protection, 'seed': seed,
+           'status': 'failed', 'robustness': None, 'process': None, 'solve_points': None, 'attack_sequence': None,
+           'seconds': None, 'error': None}
+    row.update(option_values(options))
+    start_time = time.time()
+
+    try:
+        _limit_memory(memory)
+        rd.seed(seed)
+        np.random.seed(seed)
+        # the loading prints its progress
+        with contextlib.redirect_stdout(io.StringIO()):
+            ds = FileOperations.load_data(dataset, compact=options['compact'])
+        ds = ds.to_dynamic(copy=True) if options['compact'] else ds.to_dynamic()
+        schedule = AttackSchedule.fixed(options['batch'])
+        warm_options = {'warm_start': options['warm_start'], 'hops': options['hops'],
+                        'refine_iter': options['refine_iter'], 'restart_iter': options['restart_iter']}
+        if protection == NO_PROTECTION:
+            attack = DynamicAttack(ds, CENTRALITY_ID[centrality], sink=NullSink(), **warm_options)
+            rb = attack.execute(k=options['k'], schedule=schedule)
+        else:
+            attack = DynamicAttackWithProtection(ds, CENTRALITY_ID[centrality], sink=NullSink(), **warm_options)
+            # a worker of the pool cannot start processes of its own
+            rb = attack.execute(k=options['k'], schedule=schedule, protection=protection, p=options['p'], workers=1)
+        row.update({
+            'status': 'done',
+            'robustness': float(rb),
+            'process': json.dumps([int(f) for f in attack.process]),
+            'solve_points': json.dumps(attack.solve_points),
+            'attack_sequence': json.dumps([int(v) for v in attack.node_attack_sequence])
+        })
+    except MemoryError:
+        row['status'] = 'out_of_memory'
+    except Exception:
+        row['error'] = traceback.format_exc()
+
+    row['seconds'] = time.time() - start_time
+    row['finished'] = time.time()
+    return row
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='run robustness experiments over a grid')
+    parser.add_argument('--datasets', nargs='+', required=True)
+    parser.add_argument('--centralities', nargs='+', default=['random'])
+    parser.add_argument('--protections', nargs='+', default=[NO_PROTECTION])
+    parser.add_argument('--seeds', nargs='+', type=int, default=[0])
+    parser.add_argument('--k', type=float, default=1.0)
+    parser.add_argument('--p', type=float, default=0.1)
+    parser.add_argument('--batch', type=int, default=1)
+    parser.add_argument('--warm-start', action='store_true')
+    parser.add_argument('--hops', type=int, default=1)
+    parser.add_argument('--refine-iter', type=int, default=AttackSession.REFINE_ITER)
+    parser.add_argument('--restart-iter', type=int, default=AttackSession.RESTART_ITER)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--memory', type=int, default=None, help='memory limit of each cell in MB')
+    parser.add_argument('--store', default='results/grid.sqlite')
+    args = parser.parse_args(argv)
+
+    grid = ExperimentGrid(args.datasets, args.centralities, args.protections, args.seeds, k=args.k, p=args.p,
+                          batch=args.batch, warm_start=args.warm_start, hops=args.hops, refine_iter=args.refine_iter,
+                          restart_iter=args.restart_iter)
+    grid.run(args.store, workers=args.workers, memory=args.memory)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
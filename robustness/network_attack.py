@@ -1,10 +1,18 @@
 import os
 import abc
+import time
+import random as rd
 import matplotlib.pyplot as plt
 import algorithm.iterated_greedy_algorithm as ig
+from algorithm.termination import Termination
 
 from loguru import logger
+from algorithm.attack_session import AttackSession
 from robustness.centrality import Centrality
+from robustness.attack_schedule import AttackSchedule
+from robustness.attack_checkpoint import save_checkpoint, load_checkpoint
+from robustness import attack_events as events
+from balance import balance_utils
 from common.file_operations import DynamicDataset, FileOperations
 
 logger.add(r"../results/robustness.log")
@@ -16,16 +24,42 @@ class NetworkAttack:
                          2: 'node_frustration',
                          3: 'betweenness',
                          4: 'degree',
-                         5: 'r_degree'}
+                         5: 'r_degree',
+                         6: 'page_rank'}
 
-    def __init__(self, dataset: DynamicDataset, centrality):
+    def __init__(self, dataset: DynamicDataset, centrality, warm_start=False, sink=None, hops=1,
+                 refine_iter=AttackSession.REFINE_ITER, restart_iter=AttackSession.RESTART_ITER):
+        """
+        class initialization
+
+        :param dataset: a dynamic dataset, changed by the attack
+        :param centrality: see Centrality
+        :param warm_start: keep one solver across the attack steps (see AttackSession) instead of solving again
+        :param sink: the sink of the attack events, see robustness.attack_events, default: ConsoleSink
+        :param hops: only for warm_start, radius of the region repaired after each attacked node
+        :param refine_iter: only for warm_start, number of global IG iterations after each attacked node
+        :param restart_iter: only for warm_start, IG iterations of the solve from scratch after each batch which
+                             replaces the repaired partition if it is better, 0 for none, see AttackSession.restart()
+        """
         self.dataset = dataset
         self.centrality = centrality
+        self.warm_start = warm_start
+        self.session = None
+        self.hops = hops
+        self.refine_iter = refine_iter
+        self.restart_iter = restart_iter
+        # see CentralityQueue, created by the attacks that pick nodes by degrees
+        self.centrality_queue = None
         self.process = []
+        # number of steps done when each value of self.process is recorded
+        self.solve_points = []
         self.node_attack_sequence = []
+        # the nodes whose signs are reversed now, in the order of attack
+        self.attacked_nodes = []
         self.node_attack_sequence_cache = None
         self.node_available = set(dataset.data.keys())
         self.pick_helper = Centrality(centrality)
+        self.sink = sink if sink is not None else events.ConsoleSink()
 
         # if self.centrality == Centrality.RANDOM:
         #     if os.path.exists(r"random_seq_for_97.rb"):
@@ -36,8 +70,58 @@ class NetworkAttack:
     def attack_node(self, node):
         if node not in self.node_available:
             return
-        self.dataset.reverse_node(node)
+        self.reverse_node(node)
         self.node_available.remove(node)
+        self.attacked_nodes.append(node)
+
+    def restore_node(self, node):
+        """
+        undo the attack on a node
+        """
+        self.reverse_node(node)
+        self.node_available.add(node)
+        self.attacked_nodes.remove(node)
+
+    def reverse_node(self, node):
+        if self.session is not None:
+            self.session.reverse_node(node)
+        else:
+            self.dataset.reverse_node(node)
+        if self.centrality_queue is not None:
+            self.centrality_queue.update(node)
+
+    def solve(self, max_iter=150, time_limit=None, hops=None, refine_iter=None, restart_iter=None):
+        """
+        get the frustration of the current dataset
+
+        :param max_iter: number of IG iterations of a solve from scratch
+        :param time_limit: optional, seconds of a solve from scratch, IG stops at the first of the two limits
+        :param hops: optional, replaces self.hops of the warm start
+        :param refine_iter: optional, replaces self.refine_iter of the warm start
+        :param restart_iter: optional, replaces self.restart_iter of the warm start
+        :return: an instance of IteratedGreedy
+        """
+        self.set_warm_options(hops, refine_iter, restart_iter)
+        if not self.warm_start:
+            return self.algorithm_to_get_frustration(self.dataset, max_iter=max_iter, time_limit=time_limit)
+        if self.session is None:
+            self.session = AttackSession(self.dataset, hops=self.hops, refine_iter=self.refine_iter,
+                                         max_iter=max_iter, time_limit=time_limit)
+            return self.session.alg
+
+        # the partition has been repaired when each node was attacked
+        self.session.hops, self.session.refine_iter = self.hops, self.refine_iter
+        if self.restart_iter:
+            self.session.restart(self.restart_iter)
+        return self.session.alg
+
+    def set_warm_options(self, hops=None, refine_iter=None, restart_iter=None):
+        """
+        replace the options of the warm start that are given
+        """
+        self.hops = self.hops if hops is None else hops
+        self.refine_iter = self.refine_iter if refine_iter is None else refine_iter
+        self.restart_iter = self.restart_iter if restart_iter is None else restart_iter
 
     def cluster_attack(self):
         pass
@@ -50,10 +134,167 @@ class NetworkAttack:
     def execute(self):
         pass
 
+    def attack_in_batches(self, num_of_attack, schedule=None, protected=None, checkpoint=None, checkpoint_every=1,
+                          resume=False, step_time=None, hops=None, refine_iter=None, restart_iter=None):
+        """
+        attack the nodes picked by self.pick_next() batch by batch, the frustration is solved again after each batch
+
+        :param num_of_attack: number of steps
+        :param schedule: an instance of AttackSchedule, default: one node per batch
+        :param protected: optional, the picked nodes in it are skipped instead of being attacked
+        :param checkpoint: optional, file path of the checkpoint, see robustness.attack_checkpoint
+        :param checkpoint_every: number of batches between two checkpoints
+        :param resume: continue from the checkpoint if it exists, the dataset is expected to be loaded again
+        :param step_time: optional, the time slice in seconds of the solve after each batch
+        :param hops: optional, replaces self.hops of the warm start
+        :param refine_iter: optional, replaces self.refine_iter of the warm start
+        :param restart_iter: optional, replaces self.restart_iter of the warm start
+        :return: robustness value, each attacked node counts the frustration at the end of its batch
+        """
+
+        start_time = time.time()
+        sink = self.sink
+        schedule = schedule or AttackSchedule()
+        self.set_warm_options(hops, refine_iter, restart_iter)
+        state = load_checkpoint(checkpoint) if checkpoint and resume else None
+        if state is not None:
+            alg = self.restore_checkpoint(state)
+            protected = state['protected']
+            robustness_value, i, first_batch = state['robustness_value'], state['step'], state['batch']
+            if sink.enabled(events.ATTACK_RESUMED):
+                sink.emit(events.ATTACK_RESUMED, {'step': i})
+        else:
+            protected = protected or set()
+            alg = self.solve()
+            robustness_value, i, first_batch = 0, 0, 0
+        m = self.dataset.enum
+
+        for b, size in enumerate(schedule.batches(num_of_attack, self.dataset.vnum)):
+
+            if b < first_batch:
+                continue
+            if not self.node_available:
+                break
+
+            if sink.enabled(events.STEP_STARTED):
+                sink.emit(events.STEP_STARTED, {'step': i, 'total': num_of_attack})
+            attacked = 0
+            for _ in range(size):
+                if not self.node_available:
+                    break
+                current_node = self.pick_next(alg=alg)
+                self.node_attack_sequence.append(current_node)
+                i += 1
+
+                if current_node in protected:
+                    if sink.enabled(events.NODE_PROTECTED):
+                        sink.emit(events.NODE_PROTECTED, {'step': i, 'node': current_node})
+                    self.node_available.remove(current_node)
+                    continue
+
+                self.attack_node(current_node)
+                attacked += 1
+                if sink.enabled(events.NODE_ATTACKED):
+                    sink.emit(events.NODE_ATTACKED, {'step': i, 'node': current_node})
+
+            if attacked:
+                alg = self.solve(max_iter=200, time_limit=step_time)
+                current_robustness = alg.objective_function.obj_value
+                robustness_value += attacked * (m - current_robustness)
+                if sink.enabled(events.FRUSTRATION_SOLVED):
+                    sink.emit(events.FRUSTRATION_SOLVED, {'step': i, 'frustration': current_robustness})
+                if sink.enabled(events.CLUSTER_STATS):
+                    partition = alg.objective_function.partition
+                    sink.emit(events.CLUSTER_STATS, {
+                        'step': i,
+                        'clusters': lambda: len(partition),
+                        'max_cluster_size': lambda: max(len(c) for c in partition.values())
+                    })
+
+            self.process.append(alg.objective_function.obj_value)
+            self.solve_points.append(i)
+
+            if checkpoint and (b + 1) % checkpoint_every == 0:
+                state = self.checkpoint_state(alg, protected, i, b + 1, robustness_value)
+                save_checkpoint(checkpoint, state)
+                # the run goes on from the checkpoint in the same way as a resumed run, so both give the same results
+                alg = self.continue_from(state)
+                sink.flush()
+
+        robustness_value = robustness_value / num_of_attack / m
+        if sink.enabled(events.ATTACK_FINISHED):
+            sink.emit(events.ATTACK_FINISHED, {'robustness': robustness_value, 'seconds': time.time() - start_time})
+        sink.flush()
+
+        return robustness_value
+
+    @staticmethod
+    def can_resume(checkpoint, resume):
+        return bool(checkpoint and resume and os.path.exists(checkpoint))
+
+    def checkpoint_state(self, alg, protected, step, batch, robustness_value) -> dict:
+        """
+        :return: everything needed to continue the attack after the given batch
+        """
+        return {
+            'attacked': list(self.attacked_nodes),
+            'node_available': sorted(self.node_available),
+            'protected': set(protected),
+            'process': list(self.process),
+            'solve_points': list(self.solve_points),
+            'node_attack_sequence': list(self.node_attack_sequence),
+            'solution': balance_utils.solution2array(alg.objective_function.solution, self.dataset.vnum),
+            'step': step,
+            'batch': batch,
+            'robustness_value': robustness_value,
+            'random_state': rd.getstate(),
+            'session': self.session.state() if self.session is not None else None
+        }
+
+    def restore_checkpoint(self, state) -> ig.IteratedGreedy:
+        """
+        bring a freshly loaded dataset and this attack to the state of a checkpoint without solving again
+
+        :param state: see checkpoint_state()
+        :return: an instance of IteratedGreedy holding the solution of the checkpoint
+        """
+        for node in state['attacked']:
+            self.dataset.reverse_node(node)
+        # the solver is built under the random state of the checkpoint, as in the run that wrote it
+        rd.setstate(state['random_state'])
+        return self.continue_from(state)
+
+    def continue_from(self, state) -> ig.IteratedGreedy:
+        """
+        take the state of a checkpoint as the current one, the dataset is expected to be in the state of the checkpoint
+        The run writing a checkpoint continues from it too: the node sets, the solver and the centrality queue are
+        built again in both runs, so that the orders of their sets and dicts, which break the ties, are the same.
+
+        :param state: see checkpoint_state()
+        :return: an instance of IteratedGreedy holding the solution of the checkpoint
+        """
+        self.attacked_nodes = list(state['attacked'])
+        self.node_available = set(state['node_available'])
+        self.process = list(state['process'])
+        self.solve_points = list(state['solve_points'])
+        self.node_attack_sequence = list(state['node_attack_sequence'])
+        # rebuilt from the reversed dataset when it is needed
+        self.centrality_queue = None
+
+        solution = dict(enumerate(state['solution'].tolist()))
+        if self.warm_start:
+            self.session = AttackSession(self.dataset, hops=self.hops, refine_iter=self.refine_iter, solution=solution,
+                                         state=state['session'])
+            alg = self.session.alg
+        else:
+            alg = ig.IteratedGreedy(dataset=self.dataset)
+            alg.start_from(solution)
+        return alg
+
     @staticmethod
-    def algorithm_to_get_frustration(dataset, max_iter=150):
+    def algorithm_to_get_frustration(dataset, max_iter=150, time_limit=None):
         alg = ig.IteratedGreedy(dataset=dataset)
-        alg.run(max_iter=max_iter, output=False)
+        alg.run(output=False, termination=Termination(max_iter=max(max_iter, 10), time_limit=time_limit))
         return alg
 
     def show_process(self):
@@ -2,11 +2,19 @@ import numpy as np
 import random as rd
 import networkx as nx
 from common.file_operations import Dataset
+from common.signed_graph import CompactDataset
+import balance.balance_utils as balance_utils
+from robustness.betweenness import betweenness_centrality
 
 
 def build_graph_from_networkx(dataset: Dataset):
 
     graph = nx.Graph()
+    if isinstance(dataset, CompactDataset):
+        src, dst, _ = dataset.edge_list()
+        graph.add_edges_from(zip(src.tolist(), dst.tolist()))
+        return graph
+
     for v1 in dataset.data:
         for v2 in dataset.data[v1]:
             graph.add_edge(v1, v2)
@@ -18,6 +26,12 @@ def build_graph_from_numpy(dataset: Dataset):
 
     n = dataset.vnum
     arr = np.zeros(shape=(n, n))
+    if isinstance(dataset, CompactDataset):
+        rows = dataset.rows()
+        keep = (rows < n) & (dataset.indices < n)
+        arr[rows[keep], dataset.indices[keep]] = dataset.signs[keep]
+        return arr
+
     data = dataset.data
 
     for v1 in data:
@@ -36,30 +50,23 @@ class NodeSort:
         rd.shuffle(self.node_list)
         return self.node_list
 
-    def node_frustration_sort(self, partition: dict, neighbor_structure: dict):
+    def node_frustration_sort(self, partition: dict, neighbor_structure: dict, objective_function=None):
         """
-
+        :param objective_function: optional, the scores are read from it instead of being recomputed
         """
-        frustrations = {}
-
-        for cid, community in partition.items():
-            # calculate the frustration for each cluster
-            for single_node in community:
-                if single_node not in neighbor_structure:
-                    frustrations[single_node] = -1
-                    continue
-                node_nbr = neighbor_structure[single_node]
-                frustrations[single_node] = len(node_nbr['+'] - community) + len(community & node_nbr['-'])
+        if objective_function is not None:
+            frustrations = objective_function.node_frustrations(neighbor_structure, default=-1)
+        else:
+            frustrations = balance_utils.node_frustrations(partition, neighbor_structure, default=-1)
 
         self.node_list.sort(key=frustrations.get, reverse=True)
         return self.node_list
 
-    def betweenness_centrality_sort(self, dataset):
+    def betweenness_centrality_sort(self, dataset, k=None, epsilon=None, seed=None, workers=1):
         """
-
+        see betweenness.betweenness_centrality()
         """
-        graph = build_graph_from_networkx(dataset)
-        bcs = nx.centrality.betweenness_centrality(graph)
+        bcs = betweenness_centrality(dataset, k=k, epsilon=epsilon, seed=seed, workers=workers)
         self.node_list.sort(key=bcs.get, reverse=True)
         return self.node_list
 
@@ -1,7 +1,7 @@
 from abc import ABC
 from common.file_operations import DynamicDataset, FileOperations
-from network_attack import NetworkAttack
-from centrality import Centrality
+from robustness.network_attack import NetworkAttack
+from robustness.centrality import Centrality
 
 import os
 import numpy as np
@@ -11,8 +11,8 @@ import random as rd
 class StaticAttack(NetworkAttack, ABC):
     DEFAULT_RANDOM_SEQ = r"random_seq_for_0.2.rb"
 
-    def __init__(self, dataset: DynamicDataset, centrality):
-        super().__init__(dataset, centrality)
+    def __init__(self, dataset: DynamicDataset, centrality, warm_start=False, sink=None):
+        super().__init__(dataset, centrality, warm_start=warm_start, sink=sink)
         self.attack_sequence = self.get_attack_sequence()
         self.t = 0
 
@@ -32,41 +32,39 @@ class StaticAttack(NetworkAttack, ABC):
         FileOperations.write_array_to_file(node_list, file_name=StaticAttack.DEFAULT_RANDOM_SEQ)
         return node_list
 
-    def pick_next(self):
-        return self.attack_sequence[self.t]
+    def pick_next(self, alg=None):
+        # the sequence read from a file holds floats
+        node = int(self.attack_sequence[self.t])
+        self.t += 1
+        return node
 
-    def execute(self, k=1):
+    def execute(self, k=1, schedule=None, checkpoint=None, checkpoint_every=1, resume=False, step_time=None):
         """
         the order of attack is computed in advance
+
+        :param k: ratio of attacked nodes
+        :param schedule: an instance of AttackSchedule, default: solve after every node
+        :param checkpoint: optional, file path of the checkpoint written during the attack
+        :param checkpoint_every: number of batches between two checkpoints
+        :param resume: continue from the checkpoint if it exists
+        :param step_time: optional, the time slice in seconds of each solve
+        :return: robustness value
         """
 
         num_of_attack = int(k * self.dataset.vnum)
-        alg = self.algorithm_to_get_frustration(self.dataset)
-        robustness_value = 0
-        m = self.dataset.enum
-
-        for i in range(num_of_attack):
-
-            if not self.node_available:
-                break
-
-            print("Attack is processing: {0} / {1} ...".format(i, num_of_attack))
-            current_node = self.pick_next()
-            self.attack_node(current_node)
-            alg = self.algorithm_to_get_frustration(self.dataset, max_iter=200)
-            current_robustness = alg.objective_function.obj_value
-            robustness_value += (m - current_robustness)
-
-            self.process.append(current_robustness)
-            self.t += 1
-
-            print("Node", current_node, "is attacked!")
-            print("Current frustration index:", alg.objective_function.obj_value)
-            print("Max cluster size:", max([len(c) for c in alg.objective_function.partition.values()]))
-
-        robustness_value = robustness_value / num_of_attack / m
-
-        return robustness_value
+        return self.attack_in_batches(num_of_attack, schedule=schedule, checkpoint=checkpoint,
+                                      checkpoint_every=checkpoint_every, resume=resume, step_time=step_time)
+
+    def checkpoint_state(self, alg, protected, step, batch, robustness_value) -> dict:
+        state = super().checkpoint_state(alg, protected, step, batch, robustness_value)
+        state['t'] = self.t
+        state['attack_sequence'] = list(self.attack_sequence)
+        return state
+
+    def restore_checkpoint(self, state):
+        self.t = state['t']
+        self.attack_sequence = state['attack_sequence']
+        return super().restore_checkpoint(state)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,30 @@
+import io
+import os
+import sys
+import contextlib
+import random as rd
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from common.file_operations import DynamicDataset
+from common.generate_random_signed_network import generate_signed_networks
+
+
+def small_network(c=3, n=15, k=6, pin=0.8, pn=0.1, pp=0.1, seed=0) -> DynamicDataset:
+    """
+    a small signed network of the cluster model as a dynamic dataset with plain dicts
+    """
+    rd.seed(seed)
+    with contextlib.redirect_stdout(io.StringIO()):
+        g = generate_signed_networks(c=c, n=n, k=k, pin=pin, pn=pn, pp=pp)
+    dataset = DynamicDataset()
+    dataset.vnum, dataset.enum = g.vnum, g.enum
+    dataset.data = {v: dict(g.data.get(v, {})) for v in range(g.vnum)}
+    return dataset
+
+
+@pytest.fixture
+def network():
+    return small_network()
@@ -0,0 +1,46 @@
+import random as rd
+
+import pytest
+
+from conftest import small_network
+from robustness.centrality import Centrality
+from robustness.attack_events import AttackSink, NullSink, STEP_STARTED
+from robustness.attack_schedule import AttackSchedule
+from robustness.dynamic_attack import DynamicAttack
+
+
+class Killed(Exception):
+    pass
+
+
+class KillSink(AttackSink):
+    """
+    kills the attack when the batch after the given number of batches starts
+    """
+
+    def __init__(self, batches):
+        super().__init__(events=(STEP_STARTED,))
+        self.batches = batches
+
+    def emit(self, event, payload):
+        self.batches -= 1
+        if self.batches < 0:
+            raise Killed()
+
+
+def attack(centrality, warm_start, checkpoint, sink=None, resume=False):
+    rd.seed(3)
+    network_attack = DynamicAttack(small_network(c=4, n=20, k=6, seed=1), centrality, warm_start=warm_start,
+                                  sink=sink or NullSink())
+    rb = network_attack.execute(k=0.5, schedule=AttackSchedule.fixed(3), checkpoint=checkpoint, resume=resume)
+    return rb, network_attack.process, network_attack.node_attack_sequence
+
+
+@pytest.mark.parametrize('centrality', [Centrality.RANDOM, Centrality.NODE_FRUSTRATION, Centrality.DEGREE])
+@pytest.mark.parametrize('warm_start', [False, True])
+def test_killed_and_resumed_attack_matches_the_uninterrupted_one(tmp_path, centrality, warm_start):
+    uninterrupted = attack(centrality, warm_start, str(tmp_path / 'full.pkl'))
+    checkpoint = str(tmp_path / 'killed.pkl')
+    with pytest.raises(Killed):
+        attack(centrality, warm_start, checkpoint, sink=KillSink(4))
+    assert attack(centrality, warm_start, checkpoint, resume=True) == uninterrupted
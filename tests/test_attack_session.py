@@ -0,0 +1,40 @@
+import io
+import contextlib
+import random as rd
+
+from conftest import small_network
+from robustness.centrality import Centrality
+from robustness.attack_events import NullSink
+from robustness.attack_schedule import AttackSchedule
+from robustness.dynamic_attack import DynamicAttack
+
+# the accepted drift of the warm start from a cold solve, see AttackSession
+FRUSTRATION_TOLERANCE = 0.2
+ROBUSTNESS_TOLERANCE = 0.01
+
+
+def attack(warm_start, seed):
+    rd.seed(1)
+    network = small_network(c=4, n=20, k=6, seed=seed)
+    degree_attack = DynamicAttack(network, Centrality.DEGREE, warm_start=warm_start, sink=NullSink())
+    with contextlib.redirect_stdout(io.StringIO()):
+        rb = degree_attack.execute(k=0.5, schedule=AttackSchedule.fixed(5))
+    return degree_attack, rb
+
+
+def test_warm_start_stays_close_to_cold_solves():
+    for seed in range(2):
+        cold, cold_rb = attack(False, seed)
+        warm, warm_rb = attack(True, seed)
+        assert warm.solve_points == cold.solve_points
+        assert abs(warm_rb - cold_rb) <= ROBUSTNESS_TOLERANCE
+        for warm_value, cold_value in zip(warm.process, cold.process):
+            assert warm_value <= cold_value * (1 + FRUSTRATION_TOLERANCE) + 2
+
+
+def test_warm_options_reach_the_session():
+    network = small_network(c=3, n=10, k=4)
+    warm = DynamicAttack(network, Centrality.DEGREE, warm_start=True, sink=NullSink(), hops=2, refine_iter=0)
+    with contextlib.redirect_stdout(io.StringIO()):
+        warm.attack_in_batches(3, restart_iter=0)
+    assert (warm.session.hops, warm.session.refine_iter, warm.restart_iter) == (2, 0, 0)
@@ -0,0 +1,32 @@
+import random as rd
+
+import networkx as nx
+import pytest
+
+from common.file_operations import Dataset
+from robustness.betweenness import betweenness_centrality
+
+
+def dataset_of(graph):
+    dataset = Dataset()
+    dataset.vnum, dataset.enum = graph.number_of_nodes(), graph.number_of_edges()
+    dataset.data = {v: {u: 1 for u in graph[v]} for v in graph}
+    return dataset
+
+
+@pytest.mark.parametrize('graph', [nx.cycle_graph(60), nx.path_graph(40), nx.gnm_random_graph(80, 200, seed=1)])
+def test_exact_betweenness_matches_networkx(graph):
+    # the nodes without edges are not counted by betweenness_centrality
+    graph = graph.subgraph(v for v in graph if graph.degree(v))
+    graph = nx.convert_node_labels_to_integers(graph)
+    expected = nx.betweenness_centrality(graph)
+    result = betweenness_centrality(dataset_of(graph))
+    assert result == pytest.approx({v: expected[v] for v in result})
+
+
+def test_sampled_pivots_follow_random_seed():
+    dataset = dataset_of(nx.gnm_random_graph(80, 200, seed=1))
+    rd.seed(1)
+    first = betweenness_centrality(dataset, k=10)
+    rd.seed(1)
+    assert betweenness_centrality(dataset, k=10) == first
@@ -0,0 +1,42 @@
+import sqlite3
+
+import pytest
+
+from robustness.experiment_grid import ExperimentGrid, open_store, finished_cells, write_result, cell_key, \
+    option_values
+
+CELL = ('datasets/test.g', 'degree', 'none', 0)
+
+
+def done_row(grid):
+    dataset, centrality, protection, seed = CELL
+    row = {'dataset': dataset, 'centrality': centrality, 'protection': protection, 'seed': seed, 'status': 'done',
+           'robustness': 0.5, 'process': '[]', 'solve_points': '[]', 'attack_sequence': '[]', 'seconds': 1.0,
+           'error': None, 'finished': 0.0}
+    row.update(option_values(grid.options))
+    return row
+
+
+def test_cells_with_other_options_are_not_finished(tmp_path):
+    connection = open_store(str(tmp_path / 'grid.sqlite'))
+    grid = ExperimentGrid([CELL[0]], [CELL[1]])
+    write_result(connection, done_row(grid))
+    assert cell_key(CELL, grid.options) in finished_cells(connection)
+
+    for options in ({'p': 0.2}, {'batch': 5}, {'warm_start': True}, {'compact': False}, {'refine_iter': 0}):
+        other = ExperimentGrid([CELL[0]], [CELL[1]], **options)
+        assert cell_key(CELL, other.options) not in finished_cells(connection)
+        write_result(connection, done_row(other))
+    # the rows of other options are added, not replaced
+    assert connection.execute('SELECT COUNT(*) FROM results').fetchone()[0] == 6
+    connection.close()
+
+
+def test_store_of_another_schema_is_refused(tmp_path):
+    store = str(tmp_path / 'old.sqlite')
+    connection = sqlite3.connect(store)
+    connection.execute('CREATE TABLE results (dataset TEXT, centrality TEXT, protection TEXT, seed INTEGER, k REAL, '
+                       'PRIMARY KEY (dataset, centrality, protection, seed, k))')
+    connection.close()
+    with pytest.raises(ValueError):
+        open_store(store)
@@ -0,0 +1,30 @@
+from common.file_operations import FileOperations
+
+
+def write_dataset(path, first_id=0):
+    edges = [(0, 1, 1), (1, 2, -1), (2, 3, 1), (3, 0, -1), (4, 5, 1)]
+    with open(path, 'w') as f:
+        f.write('7\t{0}\n'.format(len(edges)))
+        for n1, n2, sign in edges:
+            f.write('{0}\t{1}\t{2}\n'.format(n1 + first_id, n2 + first_id, sign))
+
+
+def as_dict(dataset):
+    return dataset.vnum, dataset.enum, {node: dict(row) for node, row in dataset.data.items()}
+
+
+def test_default_load_is_served_from_the_cache(tmp_path, capsys):
+    for first_id in (0, 1):
+        path = str(tmp_path / 'dataset_{0}.g'.format(first_id))
+        write_dataset(path, first_id)
+        parsed = FileOperations.load_data(path, cache=False)
+        written = FileOperations.load_data(path)
+        capsys.readouterr()
+        cached = FileOperations.load_data(path)
+
+        assert 'from the cache' in capsys.readouterr().out
+        assert as_dict(written) == as_dict(parsed)
+        assert as_dict(cached) == as_dict(parsed)
+        # the nodes without edges are left out, and a missing edge reads as 0
+        assert all(len(row) for row in cached.data.values())
+        assert cached.data[first_id][first_id + 2] == 0
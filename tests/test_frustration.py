@@ -0,0 +1,67 @@
+import copy
+import random as rd
+
+from balance import Frustration, Neighborhood
+from balance.cluster_index import ClusterIndex
+from balance import balance_utils as utils
+from balance.initialization import Initialization
+
+
+def solved_frustration(network):
+    neighborhood = Neighborhood(network)
+    obj = Frustration(network)
+    obj.attach_index(neighborhood.neighborhood_structure)
+    rd.seed(0)
+    Initialization(network, neighborhood).greedy_initialization(obj)
+    obj.update_objective_function()
+    return obj, neighborhood
+
+
+def assert_consistent(obj):
+    assert all(obj.partition.values()), 'empty cluster'
+    assert obj.partition == utils.solution2partition(obj.solution)
+    assert obj.obj_value == obj.objective_function()
+    rebuilt = ClusterIndex(obj.cluster_index.neighborhood_structure, obj.solution)
+    assert obj.cluster_index.cluster_links == rebuilt.cluster_links
+    assert obj.cluster_index.node_links == rebuilt.node_links
+
+
+def test_forced_decompose_of_a_single_node(network):
+    obj, neighborhood = solved_frustration(network)
+    node = next(iter(neighborhood.neighborhood_structure))
+    obj.decompose(node, obj.delta_caused_by_decompose(node, neighborhood.neighborhood_structure[node]), force=True)
+    cid = obj.solution[node]
+    assert obj.partition[cid] == {node}
+
+    before = copy.deepcopy(obj.partition)
+    obj.decompose(node, 0, force=True)
+    assert obj.solution[node] == cid
+    assert obj.partition == before
+    assert_consistent(obj)
+
+
+def test_rollback_restores_the_solution(network):
+    obj, neighborhood = solved_frustration(network)
+    structure = neighborhood.neighborhood_structure
+    solution, value = dict(obj.solution), obj.obj_value
+
+    obj.begin_journal()
+    rd.seed(1)
+    for node in rd.sample(sorted(structure), 10):
+        obj.decompose(node, obj.delta_caused_by_decompose(node, structure[node]), force=True)
+    for node in sorted(structure):
+        candidate, delta = obj.best_move(node, neighborhood)
+        if candidate != -1:
+            obj.move(node, candidate, delta)
+    for cid in list(obj.partition):
+        if cid in obj.partition:
+            candidate, delta = obj.best_merge(cid, neighborhood)
+            if candidate != -1:
+                obj.merge(cid, candidate, delta)
+    assert_consistent(obj)
+
+    obj.rollback_journal()
+    assert obj.journal is None
+    assert obj.solution == solution
+    assert obj.obj_value == value
+    assert_consistent(obj)
@@ -0,0 +1,23 @@
+import pytest
+
+from common.generate_random_signed_network import lfr_signed_edges
+
+
+@pytest.mark.parametrize('options, message', [
+    ({'n': 60}, 'max_community must not exceed n'),
+    ({'n': 300, 'average_degree': 60}, 'average_degree must be smaller than max_degree'),
+    ({'n': 40, 'min_community': 10, 'max_community': 20}, 'max_degree must be smaller than n'),
+    ({'n': 300, 'min_community': 0}, 'min_community must be at least 1'),
+    ({'n': 300, 'mu': 1.5}, r'mu must be in \[0, 1\]'),
+])
+def test_invalid_lfr_parameters_raise_value_error(options, message):
+    with pytest.raises(ValueError, match=message):
+        lfr_signed_edges(seed=0, **options)
+
+
+def test_lfr_edges_are_simple():
+    src, dst, signs, communities = lfr_signed_edges(300, seed=0)
+    assert len(communities) == 300
+    assert (src < dst).all()
+    assert len(set(zip(src.tolist(), dst.tolist()))) == len(src)
+    assert set(signs.tolist()) <= {1, -1}
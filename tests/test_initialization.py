@@ -0,0 +1,23 @@
+import random as rd
+
+from balance import Neighborhood
+from balance.initialization import Initialization
+
+
+def test_multi_start_keeps_random_state(network):
+    initialization = Initialization(network, Neighborhood(network))
+    rd.seed(5)
+    initialization.multi_start_greedy_initialization(starts=3, workers=1, seed=11)
+    after = rd.random()
+
+    rd.seed(5)
+    assert rd.random() == after
+
+
+def test_multi_start_depends_on_seed_only(network):
+    initialization = Initialization(network, Neighborhood(network))
+    rd.seed(1)
+    first, _ = initialization.multi_start_greedy_initialization(starts=3, workers=1, seed=11)
+    rd.seed(2)
+    second, _ = initialization.multi_start_greedy_initialization(starts=3, workers=1, seed=11)
+    assert first == second
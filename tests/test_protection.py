@@ -0,0 +1,24 @@
+import random as rd
+
+from robustness.centrality import Centrality
+from robustness.attack_events import NullSink
+from robustness.dynamic_attack_with_protection import DynamicAttackWithProtection
+
+
+def test_frustration_protection_keeps_random_state(network):
+    attack = DynamicAttackWithProtection(network, Centrality.RANDOM, sink=NullSink())
+    rd.seed(5)
+    attack.get_protected_nodes_by_frustration(p=0.1, workers=1, max_iter=10, seed=7)
+    after = rd.random()
+
+    # the same calls as in the function, without the solves of the candidates
+    rd.seed(5)
+    attack.algorithm_to_get_frustration(attack.dataset, max_iter=10)
+    assert rd.random() == after
+
+
+def test_frustration_protection_is_seeded(network):
+    attack = DynamicAttackWithProtection(network, Centrality.RANDOM, sink=NullSink())
+    first = attack.get_protected_nodes_by_frustration(p=0.2, workers=1, max_iter=10, seed=7)
+    second = attack.get_protected_nodes_by_frustration(p=0.2, workers=1, max_iter=10, seed=7)
+    assert first == second
@@ -0,0 +1,37 @@
+import random as rd
+
+import pytest
+
+from balance.weighted_sampler import WeightedSampler, weighted_sample
+from algorithm.iterated_greedy_algorithm import IteratedGreedy
+from algorithm.termination import Termination
+
+
+def test_sample_more_than_the_positive_weights():
+    sampler = WeightedSampler({0: .1, 1: .2, 2: .3, 3: 0})
+    assert sorted(sampler.sample(5, rng=rd.Random(0))) == [0, 1, 2]
+    # the weights are left unchanged
+    assert sampler.weights.tolist() == [.1, .2, .3, 0]
+    assert sorted(weighted_sample({0: .1, 1: .2, 2: .3, 3: 0}, 5)) == [0, 1, 2]
+
+
+def test_update_in_place():
+    sampler = WeightedSampler({0: 1.0, 1: 1.0, 2: 1.0})
+    sampler.update(0, 0)
+    sampler.update(2, 5.0)
+    assert sampler.total == pytest.approx(6.0)
+    rng = rd.Random(0)
+    assert all(sampler.sample(1, rng=rng) != [0] for _ in range(100))
+    assert sorted(sampler.sample(3, rng=rng)) == [1, 2]
+
+
+def test_roulette_destruction_keeps_the_weights_up_to_date(network):
+    rd.seed(0)
+    alg = IteratedGreedy(network, roulette=True)
+    alg.run(output=False, termination=Termination(max_iter=10, extend=0))
+    obj = alg.objective_function
+    sampler = obj.frustration_sampler()
+    assert sampler is obj.cluster_index.sampler
+    expected = obj.cluster_index.frustrations()
+    for node, frustration in expected.items():
+        assert sampler.weights[sampler.position[node]] == frustration